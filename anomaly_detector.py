@@ -0,0 +1,237 @@
+"""
+Anomaly Detector Module
+Detects abnormal readings and load peaks in the energy consumption series
+"""
+
+import numpy as np
+import pandas as pd
+import config
+
+
+class AnomalyDetector:
+    """Streams rolling z-scores over model/seasonal residuals"""
+    
+    def __init__(self, predictor=None, window=None, z_threshold=None,
+                 peak_threshold=None, min_periods=None):
+        """
+        Initialize the anomaly detector
+        
+        Args:
+            predictor: Optional trained EnergyPredictor; when given, residuals
+                are taken against its predictions instead of the seasonal baseline
+            window: Trailing window (hours) for the rolling residual statistics
+            z_threshold: |z| above which a reading is flagged as an anomaly
+            peak_threshold: z above which a local maximum is recorded as a peak
+            min_periods: Minimum history before a reading can be scored
+        """
+        self.predictor = predictor
+        self.window = window or config.ANOMALY_WINDOW
+        self.z_threshold = z_threshold or config.ANOMALY_Z_THRESHOLD
+        self.peak_threshold = peak_threshold or config.PEAK_Z_THRESHOLD
+        self.min_periods = min_periods or config.ANOMALY_MIN_PERIODS
+        self._reset()
+    
+    def _reset(self):
+        """Clear all detection state"""
+        # Seasonal baseline: running mean per (day_of_week, hour) segment
+        self._baseline_sum = np.zeros(7 * 24)
+        self._baseline_count = np.zeros(7 * 24)
+        
+        # Trailing residuals/values kept for incremental updates
+        self._tail_times = np.empty(0, dtype='int64')
+        self._tail_values = np.empty(0)
+        self._tail_expected = np.empty(0)
+        self._tail_residuals = np.empty(0)
+        
+        # Sorted indexes of detected events (timestamps as int64 nanoseconds)
+        self._anomalies = self._empty_index()
+        self._peaks = self._empty_index()
+    
+    @staticmethod
+    def _empty_index():
+        """Create an empty event index"""
+        return {
+            'times': np.empty(0, dtype='int64'),
+            'values': np.empty(0),
+            'expected': np.empty(0),
+            'z_scores': np.empty(0)
+        }
+    
+    @staticmethod
+    def _segments(times):
+        """Map timestamps to their (day_of_week * 24 + hour) segment"""
+        return times.dayofweek.to_numpy() * 24 + times.hour.to_numpy()
+    
+    def _expected(self, times):
+        """Expected load for each timestamp (model prediction or seasonal mean)"""
+        if self.predictor is not None and self.predictor.is_trained:
+            expected = self.predictor.predict_batch(times)
+            if expected is not None:
+                return expected
+        
+        counts = np.maximum(self._baseline_count, 1)
+        return (self._baseline_sum / counts)[self._segments(times)]
+    
+    def _update_baseline(self, times, values):
+        """Fold readings into the seasonal baseline sums"""
+        segments = self._segments(times)
+        self._baseline_sum += np.bincount(segments, weights=values, minlength=7 * 24)
+        self._baseline_count += np.bincount(segments, minlength=7 * 24)
+    
+    def fit(self, df):
+        """
+        Run detection over the full history
+        
+        The seasonal baseline is seeded from the whole history, including
+        readings after the one being scored, while update() scores new
+        readings against the baseline as it stood before them. Fitting part
+        of a history and updating with the rest therefore flags slightly
+        different anomalies than one fit over all of it.
+        
+        Args:
+            df: DataFrame with datetime and energy columns, sorted by time
+        
+        Returns:
+            Number of anomalies detected
+        """
+        self._reset()
+        
+        times = pd.DatetimeIndex(df[config.DATETIME_COL])
+        values = df[config.ENERGY_COL].to_numpy(dtype=float)
+        
+        # Seed the seasonal baseline with the whole history before scoring
+        self._update_baseline(times, values)
+        self._process(times, values, self._expected(times))
+        
+        return len(self._anomalies['times'])
+    
+    def update(self, new_df):
+        """
+        Score newly appended readings
+        
+        Only the trailing window kept from the previous call is revisited,
+        so each update costs O(window + new rows).
+        
+        Args:
+            new_df: DataFrame of readings newer than those already seen
+        
+        Returns:
+            Number of new anomalies detected
+        """
+        if new_df is None or len(new_df) == 0:
+            return 0
+        
+        before = len(self._anomalies['times'])
+        
+        times = pd.DatetimeIndex(new_df[config.DATETIME_COL])
+        values = new_df[config.ENERGY_COL].to_numpy(dtype=float)
+        
+        # Score against the baseline as it stood, then learn from the new rows
+        expected = self._expected(times)
+        self._update_baseline(times, values)
+        self._process(times, values, expected)
+        
+        return len(self._anomalies['times']) - before
+    
+    def _process(self, times, values, expected):
+        """Score new readings using the kept tail as rolling history"""
+        n_tail = len(self._tail_times)
+        
+        all_times = np.concatenate([self._tail_times, times.to_numpy('datetime64[ns]').view('int64')])
+        all_values = np.concatenate([self._tail_values, values])
+        all_expected = np.concatenate([self._tail_expected, expected])
+        residuals = np.concatenate([self._tail_residuals, values - expected])
+        
+        # Rolling mean/std of the preceding `window` residuals via cumulative sums
+        n = len(residuals)
+        csum = np.concatenate([[0.0], np.cumsum(residuals)])
+        csum_sq = np.concatenate([[0.0], np.cumsum(residuals ** 2)])
+        
+        idx = np.arange(n)
+        start = np.maximum(idx - self.window, 0)
+        count = idx - start
+        safe_count = np.maximum(count, 1)
+        
+        mean = (csum[idx] - csum[start]) / safe_count
+        var = (csum_sq[idx] - csum_sq[start]) / safe_count - mean ** 2
+        std = np.sqrt(np.maximum(var, 0))
+        
+        valid = (count >= self.min_periods) & (std > 0)
+        z_scores = np.zeros(n)
+        z_scores[valid] = (residuals[valid] - mean[valid]) / std[valid]
+        
+        # Anomalies: only the new rows are scored here
+        new = np.zeros(n, dtype=bool)
+        new[n_tail:] = True
+        self._append_events(self._anomalies, new & (np.abs(z_scores) > self.z_threshold),
+                            all_times, all_values, all_expected, z_scores)
+        
+        # Peaks: local maxima need the next reading, so the last row of the
+        # previous tail is decided now and the final row waits for the next update
+        decidable = np.zeros(n, dtype=bool)
+        decidable[max(n_tail - 1, 0):n - 1] = True
+        is_peak = np.zeros(n, dtype=bool)
+        is_peak[1:-1] = (all_values[1:-1] >= all_values[:-2]) & (all_values[1:-1] > all_values[2:])
+        self._append_events(self._peaks, decidable & is_peak & (z_scores > self.peak_threshold),
+                            all_times, all_values, all_expected, z_scores)
+        
+        # Keep the trailing window for the next update
+        keep = slice(max(n - self.window, 0), n)
+        self._tail_times = all_times[keep]
+        self._tail_values = all_values[keep]
+        self._tail_expected = all_expected[keep]
+        self._tail_residuals = residuals[keep]
+    
+    @staticmethod
+    def _append_events(index, mask, times, values, expected, z_scores):
+        """Append flagged rows to an event index (rows arrive in time order)"""
+        if not mask.any():
+            return
+        
+        index['times'] = np.concatenate([index['times'], times[mask]])
+        index['values'] = np.concatenate([index['values'], values[mask]])
+        index['expected'] = np.concatenate([index['expected'], expected[mask]])
+        index['z_scores'] = np.concatenate([index['z_scores'], z_scores[mask]])
+    
+    @staticmethod
+    def _query(index, start, end):
+        """Return events in [start, end] using binary search on the time index"""
+        lo = 0
+        hi = len(index['times'])
+        if start is not None:
+            lo = np.searchsorted(index['times'], pd.Timestamp(start).value, side='left')
+        if end is not None:
+            hi = np.searchsorted(index['times'], pd.Timestamp(end).value, side='right')
+        
+        return pd.DataFrame({
+            config.DATETIME_COL: pd.to_datetime(index['times'][lo:hi]),
+            config.ENERGY_COL: index['values'][lo:hi],
+            'expected': index['expected'][lo:hi],
+            'z_score': index['z_scores'][lo:hi]
+        })
+    
+    def get_anomalies(self, start=None, end=None):
+        """
+        Get anomalies detected between two datetimes (inclusive)
+        
+        Args:
+            start: Start datetime (None for the beginning)
+            end: End datetime (None for the end)
+        
+        Returns:
+            DataFrame with datetime, energy, expected and z_score columns
+        """
+        return self._query(self._anomalies, start, end)
+    
+    def get_peaks(self, start=None, end=None):
+        """
+        Get load peaks detected between two datetimes (inclusive)
+        
+        Args:
+            start: Start datetime (None for the beginning)
+            end: End datetime (None for the end)
+        
+        Returns:
+            DataFrame with datetime, energy, expected and z_score columns
+        """
+        return self._query(self._peaks, start, end)
@@ -0,0 +1,111 @@
+"""
+Benchmarks Module
+Measures the latency of common data operations
+"""
+
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import config
+from storage import CSVStorage, SQLiteStorage
+
+
+def _time_queries(storage, ranges):
+    """Run range queries and return per-query latencies in milliseconds"""
+    latencies = []
+    for start, end in ranges:
+        t0 = time.perf_counter()
+        storage.range_stats(start, end)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return np.array(latencies)
+
+
+def bench_storage(n_queries=100, seed=42):
+    """
+    Compare range-query latency of the CSV/pandas and SQLite backends
+    
+    Both backends answer the same random 1-day, 1-week, 1-month and 1-year
+    range statistics queries over the dataset.
+    
+    Args:
+        n_queries: Queries per range length
+        seed: Random seed for the query start times
+    
+    Returns:
+        DataFrame with median and p95 latency (ms) per backend and range length
+    """
+    csv_storage = CSVStorage()
+    frame = csv_storage.load()
+    first = frame[config.DATETIME_COL].min()
+    last = frame[config.DATETIME_COL].max()
+    
+    # Build the database in a temporary directory so the benchmark is repeatable
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        t0 = time.perf_counter()
+        sqlite_storage = SQLiteStorage(os.path.join(tmp_dir, 'bench.db'))
+        sqlite_storage.import_csv(config.DATASET_FILE)
+        import_seconds = time.perf_counter() - t0
+        
+        rng = np.random.default_rng(seed)
+        lengths = {'1 day': pd.Timedelta(days=1), '1 week': pd.Timedelta(days=7),
+                   '1 month': pd.Timedelta(days=30), '1 year': pd.Timedelta(days=365)}
+        
+        results = []
+        for label, length in lengths.items():
+            span = (last - length - first).total_seconds()
+            starts = first + pd.to_timedelta(rng.uniform(0, span, n_queries), unit='s')
+            ranges = [(start, start + length) for start in starts]
+            
+            for name, storage in [('csv', csv_storage), ('sqlite', sqlite_storage)]:
+                latencies = _time_queries(storage, ranges)
+                results.append({
+                    'backend': name,
+                    'range': label,
+                    'median_ms': float(np.median(latencies)),
+                    'p95_ms': float(np.percentile(latencies, 95))
+                })
+        
+        sqlite_storage.close()
+    
+    results = pd.DataFrame(results)
+    print(f"SQLite import: {import_seconds:.2f}s")
+    print(results.to_string(index=False))
+    return results
+
+
+
+def bench_forecast(horizon=365 * 24, repeats=5):
+    """
+    Measure batch forecast throughput of the saved model
+    
+    Args:
+        horizon: Hours forecast per batch
+        repeats: Number of timed batches
+        
+    Returns:
+        Forecast throughput in hours per second, or None if no model is saved
+    """
+    from predictor import EnergyPredictor
+    
+    predictor = EnergyPredictor()
+    if not predictor.load_model():
+        return None
+    
+    times = pd.Timestamp.now().normalize() + pd.to_timedelta(np.arange(horizon), unit='h')
+    
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        predictor.predict_interval(times)
+    seconds = (time.perf_counter() - t0) / repeats
+    
+    throughput = horizon / seconds
+    print(f"Forecast ({predictor.model_type}): {horizon} hours in {seconds * 1000:.1f} ms "
+          f"({throughput:,.0f} hours/s)")
+    return throughput
+
+
+if __name__ == '__main__':
+    bench_storage()
+    bench_forecast()
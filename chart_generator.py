@@ -4,7 +4,6 @@ Creates visualizations for energy consumption data
 """
 
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.dates as mdates
 from datetime import datetime
 import config
@@ -136,6 +135,55 @@ class ChartGenerator:
         
         return fig
     
+    def create_heatmap_chart(self, profile, kind='hour_weekday', title="Seasonal Load Profile",
+                             label='Average Energy (MW)'):
+        """
+        Create a heatmap of a seasonal profile matrix
+        
+        The matrix is drawn as a single image, so the cost does not grow
+        with the number of cells.
+        
+        Args:
+            profile: Array with one row per hour of day (from
+                DataManager.get_seasonal_profile)
+            kind: 'hour_weekday' or 'hour_dayofyear'
+            title: Chart title
+            label: Colorbar label
+            
+        Returns:
+            matplotlib Figure object
+        """
+        fig, ax = plt.subplots(figsize=(10, 5))
+        
+        # Draw the whole matrix as one image; empty cells stay transparent
+        image = ax.imshow(profile, aspect='auto', origin='lower',
+                          cmap='YlOrRd', interpolation='nearest')
+        fig.colorbar(image, ax=ax, label=label)
+        
+        # Formatting
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.set_ylabel('Hour of Day', fontsize=11)
+        ax.set_yticks(range(0, 24, 3))
+        
+        if kind == 'hour_weekday':
+            ax.set_xlabel('Day of Week', fontsize=11)
+            ax.set_xticks(range(7))
+            ax.set_xticklabels(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])
+        else:
+            ax.set_xlabel('Month', fontsize=11)
+            # Day-of-year offsets where each month starts (leap year layout)
+            month_starts = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]
+            ax.set_xticks(month_starts)
+            ax.set_xticklabels(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+        
+        ax.grid(False)
+        
+        # Tight layout
+        plt.tight_layout()
+        
+        return fig
+    
     def create_prediction_chart(self, predictions, title="Energy Consumption Predictions"):
         """
         Create a chart showing predictions
@@ -175,6 +223,15 @@ class ChartGenerator:
                         alpha=0.2,
                         color=config.CHART_COLORS['info'])
         
+        # Shade the prediction interval when available
+        if predictions[0].get('lower') is not None:
+            ax.fill_between(x_values,
+                            [p['lower'] for p in predictions],
+                            [p['upper'] for p in predictions],
+                            alpha=0.15,
+                            color=config.CHART_COLORS['secondary'],
+                            label='Prediction Interval')
+        
         # Formatting
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
         ax.set_xlabel(xlabel, fontsize=11)
@@ -259,6 +316,9 @@ class ChartGenerator:
         Returns:
             FigureCanvasTkAgg object
         """
+        # Imported here so headless (Agg) rendering does not need Tk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         canvas = FigureCanvasTkAgg(figure, parent_widget)
         canvas.draw()
         return canvas
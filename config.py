@@ -7,6 +7,12 @@ Contains all system settings and constants
 DATASET_FILE = 'dataset.csv'
 MODEL_FILE = 'energy_model.pkl'
 
+# Data settings
+STORAGE_BACKEND = 'csv'  # 'csv' (DATASET_FILE) or 'sqlite' (SQLITE_FILE)
+SQLITE_FILE = 'energy.db'
+SQLITE_BATCH_SIZE = 10000  # Rows per executemany batch on bulk inserts
+NORMALIZE_HOURLY_GRID = True  # Aggregate duplicates and fill gaps onto a regular hourly grid
+
 # Energy pricing (cost per kWh in currency units)
 ENERGY_COST_PER_KWH = 0.12
 
@@ -24,6 +30,19 @@ DEVICES = {
     'Desktop Computer': 200
 }
 
+# Flexible devices the load-shifting optimizer may reschedule
+# duration: hours per run, earliest/latest: allowed hour-of-day window (end exclusive)
+FLEXIBLE_DEVICES = {
+    'Washing Machine': {'duration': 2, 'earliest': 7, 'latest': 22},
+    'Water Heater': {'duration': 1, 'earliest': 0, 'latest': 24},
+    'Air Conditioner': {'duration': 2, 'earliest': 10, 'latest': 18}  # Precooling run
+}
+HOUSEHOLD_BASE_LOAD_KW = 1.0  # Average non-flexible household load used for peak shaving
+
+# Seasonal profiles: columns per hour-of-day row
+SEASONAL_PROFILES = {'hour_weekday': 7, 'hour_dayofyear': 366}
+SEASONAL_QUANTILE = 0.95  # Quantile reported as 'p95'
+
 # Chart settings
 CHART_COLORS = {
     'primary': '#2E86DE',
@@ -44,9 +63,62 @@ FONT_FAMILY = "Arial"
 # Prediction settings
 PREDICTION_DAYS = 7  # Number of days to predict ahead
 TRAINING_TEST_SPLIT = 0.2  # 20% for testing
+MODEL_TYPE = 'linear'  # 'linear' (one global fit), 'segmented' (one fit per weekday/hour) or 'ridge'
+MIN_SEGMENT_SAMPLES = 20  # Segments with fewer rows fall back to the global fit
+PREDICTION_INTERVAL_LEVEL = 0.95  # Coverage of forecast intervals
+PREDICTION_INTERVAL_METHOD = 'analytic'  # 'analytic' (residual variance) or 'conformal'
+RIDGE_ALPHA = 1.0  # Penalty of the 'ridge' model when no search result is saved
+
+# Hyperparameter search settings
+SEARCH_ALPHAS = [0.0, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0, 10000.0, 100000.0]
+SEARCH_FOLDS = 5  # Contiguous time blocks used as validation folds
+SEARCH_RESULT_FILE = 'search_result.json'  # Best configuration, used by the 'ridge' model
+
+# Features used for training and prediction (order matters)
+FEATURE_COLUMNS = ['hour', 'day_of_week', 'month', 'day_of_year',
+                   'hour_sin', 'hour_cos', 'month_sin', 'month_cos']
+
+# Feature cache (memory-mapped .npy files keyed by dataset and feature schema)
+FEATURE_CACHE_DIR = '.feature_cache'  # None disables the cache
+FEATURE_SCHEMA_VERSION = 1  # Bump when the feature computation changes
+
+# Exogenous data (None disables the source)
+TEMPERATURE_FILE = None  # CSV with DATETIME_COL and TEMPERATURE_COL columns
+HOLIDAY_FILE = None  # CSV with one HOLIDAY_DATE_COL row per holiday
+TEMPERATURE_COL = 'temperature'
+HOLIDAY_DATE_COL = 'date'
+EXOGENOUS_TOLERANCE_HOURS = 3  # Older readings fall back to the (month, hour) climatology
+
+# Profiling settings
+PROFILE_ENV_VAR = 'SEMS_PROFILE'  # e.g. SEMS_PROFILE="calls=20" or "seconds=60,dir=/tmp/profiles"
+PROFILE_OUTPUT_DIR = 'profiles'
+PROFILE_DEFAULT_CALLS = 20  # Window length when neither calls nor seconds is given
+PROFILE_TOP_N = 25  # Entries in the function and allocation reports
+PROFILE_TRACEBACK_DEPTH = 10  # Frames kept per tracemalloc allocation
+PROFILE_MAX_STACK_DEPTH = 64  # Deepest collapsed stack written
+
+# Retraining settings
+RETRAIN_INTERVAL_SECONDS = 24 * 60 * 60  # How often the background scheduler retrains
+RETRAIN_VALIDATION_HOURS = 28 * 24  # Most recent hours held out to compare old vs new model
+RETRAIN_TOLERANCE = 0.02  # Accept a new model if its RMSE is at most 2% worse
+
+# Anomaly detection settings
+ANOMALY_WINDOW = 168  # Trailing window (hours) for rolling residual statistics
+ANOMALY_MIN_PERIODS = 24  # Minimum history before a reading can be scored
+ANOMALY_Z_THRESHOLD = 3.5  # |z| above this is flagged as an anomaly
+PEAK_Z_THRESHOLD = 2.0  # Local maxima with z above this are recorded as peaks
 
 # Report settings
 REPORT_TYPES = ['Daily', 'Weekly', 'Monthly']
+REPORT_OUTPUT_DIR = 'reports'  # Where exported report charts are written
+REPORT_CHART_FORMAT = 'png'  # 'png', 'svg' or 'html'
+REPORT_DPI = 100
+
+# Command line settings
+CLI_CHUNK_HOURS = 30 * 24  # Forecast hours per worker task
+
+# Shared memory settings (multi-process serving)
+SHARED_STORE_NAME = 'sems'  # Prefix for shared memory blocks
 
 # Dataset column names
 DATETIME_COL = 'Datetime'
@@ -3,61 +3,651 @@ Data Manager Module
 Handles loading, processing, and managing energy consumption data
 """
 
+import hashlib
+import json
+import os
+from contextlib import contextmanager
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import config
+from exogenous import ExogenousData
+import profiler
+from profiler import profiled
+from shared_store import SharedArrayStore
+from storage import get_storage
+
+try:
+    import fcntl
+except ImportError:  # Windows: the feature cache is used without a lock file
+    fcntl = None
+
+HOUR_NS = 3600 * 10**9  # One hour in nanoseconds
+
+
+def calendar_features(times):
+    """
+    Compute the calendar features for a batch of timestamps
+    
+    Args:
+        times: DatetimeIndex (or anything pd.DatetimeIndex accepts)
+        
+    Returns:
+        Dictionary of feature name -> numpy array
+    """
+    times = pd.DatetimeIndex(times)
+    hour = times.hour.to_numpy()
+    month = times.month.to_numpy()
+    
+    return {
+        'hour': hour,
+        'day_of_week': times.dayofweek.to_numpy(),
+        'month': month,
+        'day_of_year': times.dayofyear.to_numpy(),
+        'hour_sin': np.sin(2 * np.pi * hour / 24),
+        'hour_cos': np.cos(2 * np.pi * hour / 24),
+        'month_sin': np.sin(2 * np.pi * month / 12),
+        'month_cos': np.cos(2 * np.pi * month / 12)
+    }
 
 
 class DataManager:
     """Manages energy consumption data from CSV file"""
     
-    def __init__(self):
-        """Initialize the DataManager"""
+    def __init__(self, storage=None):
+        """
+        Initialize the DataManager
+        
+        Args:
+            storage: Storage backend (defaults to the one selected in config)
+        """
+        self.storage = storage
         self.df = None
         self.processed_df = None
         
+        # Regular hourly grid: hour i is grid_start + i hours
+        self.grid_start = None
+        self.grid_sums = None
+        self.grid_counts = None
+        self.grid_values = None
+        self.grid_mask = None
+        self.quality_report = None
+        
+        # Seasonal profile accumulators, built on first use and kept up to date
+        self.profiles = {}
+        
+        # Optional temperature/holiday series joined onto the readings
+        self.exogenous = None
+        
+        # Feature matrix and target mapped from the feature cache
+        self.feature_matrix = None
+        self.target = None
+        
+    @property
+    def feature_columns(self):
+        """Feature columns produced by prepare_features, exogenous columns last"""
+        if self.exogenous is None:
+            return list(config.FEATURE_COLUMNS)
+        return list(config.FEATURE_COLUMNS) + self.exogenous.columns
+    
+    @profiled
     def load_data(self):
-        """Load data from CSV file"""
+        """Load data from the configured storage backend"""
         try:
-            # Load the dataset
-            self.df = pd.read_csv(config.DATASET_FILE)
+            if self.storage is None:
+                self.storage = get_storage()
             
-            # Convert datetime column to datetime type
-            self.df[config.DATETIME_COL] = pd.to_datetime(self.df[config.DATETIME_COL])
+            # Load the dataset
+            self.df = self.storage.load()
             
             # Sort by datetime
             self.df = self.df.sort_values(config.DATETIME_COL)
             
             # Remove any missing values
             self.df = self.df.dropna()
+            raw_records = len(self.df)
+            self.feature_matrix = None
+            self.target = None
             
-            print(f"✓ Data loaded successfully: {len(self.df)} records")
+            # Put the series on a regular hourly grid
+            if config.NORMALIZE_HOURLY_GRID:
+                self.grid_start = None
+                self._merge_into_grid(self.df[config.DATETIME_COL], self.df[config.ENERGY_COL])
+            
+            print(f"✓ Data loaded successfully: {raw_records} records")
+            
+            # Pick up configured temperature/holiday files automatically
+            if self.exogenous is None and (config.TEMPERATURE_FILE or config.HOLIDAY_FILE):
+                self.load_exogenous()
             return True
             
         except Exception as e:
             print(f"✗ Error loading data: {str(e)}")
             return False
     
+    @profiled
+    def append_data(self, new_data, persist=False):
+        """
+        Append newly received readings to the loaded data
+        
+        Args:
+            new_data: DataFrame (or list of dicts) with datetime and energy columns
+            persist: Also write the readings to the storage backend
+            
+        Returns:
+            DataFrame of the rows actually appended, or None on error
+        """
+        if self.df is None:
+            print("✗ Load data before appending readings")
+            return None
+        
+        try:
+            new_df = pd.DataFrame(new_data)[[config.DATETIME_COL, config.ENERGY_COL]]
+            new_df[config.DATETIME_COL] = pd.to_datetime(new_df[config.DATETIME_COL])
+            new_df = new_df.sort_values(config.DATETIME_COL).dropna()
+            
+            # Only accept readings newer than what we already have so the
+            # series stays sorted
+            last_time = self.df[config.DATETIME_COL].iloc[-1]
+            new_df = new_df[new_df[config.DATETIME_COL] > last_time]
+            
+            if persist:
+                self.storage.append(new_df)
+            
+            # The next prepare_features extends the feature cache
+            self.processed_df = None
+            self.feature_matrix = None
+            self.target = None
+            
+            if self.grid_start is not None:
+                old_len = len(self.df)
+                self._merge_into_grid(new_df[config.DATETIME_COL], new_df[config.ENERGY_COL])
+                return self.df.iloc[old_len:]
+            
+            self.df = pd.concat([self.df, new_df], ignore_index=True)
+            return new_df
+            
+        except Exception as e:
+            print(f"✗ Error appending data: {str(e)}")
+            return None
+    
+    def _merge_into_grid(self, times, values):
+        """
+        Aggregate readings into the regular hourly grid
+        
+        Readings are mapped to hour offsets by arithmetic, duplicate hours
+        (e.g. DST repeats) are averaged with bincount and missing hours are
+        filled by linear interpolation and marked in grid_mask. Only the part
+        of the grid touched by the new readings is recomputed.
+        
+        Args:
+            times: Series of reading datetimes (sorted)
+            values: Series of energy readings
+        """
+        ns = times.to_numpy('datetime64[ns]').view('int64')
+        values = values.to_numpy(dtype=float)
+        
+        if self.grid_start is None:
+            self.grid_start = pd.Timestamp(ns[0] - ns[0] % HOUR_NS)
+            self.grid_sums = np.zeros(0)
+            self.grid_counts = np.zeros(0, dtype=np.int64)
+            self.grid_values = np.zeros(0)
+            self.quality_report = {'raw_records': 0, 'off_grid_timestamps': 0}
+            self.profiles = {}
+        
+        offsets = (ns - self.grid_start.value) // HOUR_NS
+        old_len = len(self.grid_counts)
+        n_hours = max(old_len, int(offsets.max()) + 1)
+        
+        sums = np.bincount(offsets, weights=values, minlength=n_hours)
+        counts = np.bincount(offsets, minlength=n_hours)
+        sums[:old_len] += self.grid_sums
+        counts[:old_len] += self.grid_counts
+        mask = counts > 0
+        
+        # Recompute from the last valid hour before the first touched hour so
+        # interpolation across a gap uses the right anchor
+        first = int(offsets.min())
+        valid_before = np.flatnonzero(mask[:first])
+        lo = int(valid_before[-1]) if len(valid_before) else first
+        
+        region_mask = mask[lo:]
+        region = np.zeros(n_hours - lo)
+        region[region_mask] = sums[lo:][region_mask] / counts[lo:][region_mask]
+        hours = np.arange(len(region))
+        region[~region_mask] = np.interp(hours[~region_mask], hours[region_mask], region[region_mask])
+        
+        grid_values = np.empty(n_hours)
+        grid_values[:lo] = self.grid_values[:lo]
+        grid_values[lo:] = region
+        replaced = self.grid_values[lo:]
+        
+        self.grid_sums = sums
+        self.grid_counts = counts
+        self.grid_values = grid_values
+        self.grid_mask = mask
+        self._update_profiles(lo, replaced)
+        
+        # Rebuild only the affected tail of the data frame
+        tail = pd.DataFrame({
+            config.DATETIME_COL: self.grid_start + pd.to_timedelta(np.arange(lo, n_hours), unit='h'),
+            config.ENERGY_COL: region
+        }, index=pd.RangeIndex(lo, n_hours))
+        
+        if lo == 0 or self.df is None or old_len == 0:
+            self.df = tail
+        else:
+            self.df = pd.concat([self.df.iloc[:lo], tail])
+        
+        # Data quality report
+        valid_hours = np.flatnonzero(mask)
+        self.quality_report['raw_records'] += len(ns)
+        self.quality_report['off_grid_timestamps'] += int(np.count_nonzero(ns % HOUR_NS))
+        self.quality_report.update({
+            'start': self.grid_start,
+            'end': self.grid_start + pd.Timedelta(hours=n_hours - 1),
+            'grid_hours': n_hours,
+            'duplicate_hours': int(np.count_nonzero(counts > 1)),
+            'duplicates_aggregated': int(np.sum(counts[counts > 1] - 1)),
+            'missing_hours_filled': int(n_hours - len(valid_hours)),
+            'largest_gap_hours': int(np.diff(valid_hours).max() - 1) if len(valid_hours) > 1 else 0
+        })
+    
+    def time_to_index(self, timestamp):
+        """
+        Map a timestamp to its offset in the hourly grid
+        
+        Args:
+            timestamp: Datetime to look up
+            
+        Returns:
+            Integer offset, or None if outside the grid
+        """
+        if self.grid_start is None:
+            return None
+        
+        index = (pd.Timestamp(timestamp).value - self.grid_start.value) // HOUR_NS
+        if index < 0 or index >= len(self.grid_values):
+            return None
+        return int(index)
+    
+    def get_day_matrix(self):
+        """
+        Get the hourly grid as whole days
+        
+        Returns:
+            Tuple of (dates, matrix) where matrix has shape (n_days, 24) and
+            row i holds the 24 hourly loads of dates[i]; (None, None) if no grid
+        """
+        if self.grid_start is None:
+            return None, None
+        
+        # First full day starts at the first midnight on the grid
+        first = (24 - self.grid_start.hour) % 24
+        n_days = (len(self.grid_values) - first) // 24
+        matrix = self.grid_values[first:first + n_days * 24].reshape(n_days, 24)
+        dates = (self.grid_start + pd.Timedelta(hours=first)).normalize() + pd.to_timedelta(np.arange(n_days), unit='D')
+        
+        return dates.date, matrix
+    
+    def load_exogenous(self, temperature_file=None, holiday_file=None):
+        """
+        Load temperature and holiday series to use as extra features
+        
+        Args:
+            temperature_file: Hourly temperature CSV (defaults to config.TEMPERATURE_FILE)
+            holiday_file: Holiday calendar CSV (defaults to config.HOLIDAY_FILE)
+            
+        Returns:
+            True if at least one series was loaded
+        """
+        try:
+            exogenous = ExogenousData(temperature_file, holiday_file)
+            if not exogenous.columns:
+                print("ℹ No exogenous data files configured")
+                return False
+            
+            self.exogenous = exogenous
+            print(f"✓ Exogenous data loaded: {', '.join(exogenous.columns)}")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Error loading exogenous data: {str(e)}")
+            return False
+    
+    def _profile_cells(self, kind, start, stop):
+        """
+        Flat profile cell (hour * columns + weekday/day-of-year) of grid rows start..stop
+        
+        Days of year use the leap-year layout: non-leap days from March 1 on
+        shift by one so every calendar date has the same column and column 59
+        holds only February 29.
+        """
+        times = self.grid_start + pd.to_timedelta(np.arange(start, stop), unit='h')
+        if kind == 'hour_weekday':
+            column = times.dayofweek.to_numpy()
+        else:
+            column = times.dayofyear.to_numpy() - 1
+            column += (~times.is_leap_year) & (column >= 59)
+        return times.hour.to_numpy() * config.SEASONAL_PROFILES[kind] + column
+    
+    @staticmethod
+    def _cell_extremes(cells, values, targets):
+        """
+        Quantile and maximum of the values in each target cell
+        
+        One lexsort orders the values by cell, after which every cell is a
+        contiguous sorted run and its quantile is read off by position.
+        
+        Returns:
+            Tuple of (quantiles, maxima) aligned with targets (NaN for empty cells)
+        """
+        order = np.lexsort((values, cells))
+        sorted_cells = cells[order]
+        sorted_values = values[order]
+        
+        starts = np.searchsorted(sorted_cells, targets, side='left')
+        counts = np.searchsorted(sorted_cells, targets, side='right') - starts
+        present = counts > 0
+        
+        # Linear interpolation between order statistics, as np.quantile does
+        position = starts + (np.maximum(counts, 1) - 1) * config.SEASONAL_QUANTILE
+        below = np.floor(position).astype(np.intp)
+        above = np.minimum(below + 1, np.maximum(starts + counts - 1, 0))
+        fraction = position - below
+        
+        safe_below = np.minimum(below, max(len(sorted_values) - 1, 0))
+        safe_above = np.minimum(above, max(len(sorted_values) - 1, 0))
+        quantiles = sorted_values[safe_below] * (1 - fraction) + sorted_values[safe_above] * fraction
+        maxima = sorted_values[np.maximum(starts + counts - 1, 0)]
+        
+        return np.where(present, quantiles, np.nan), np.where(present, maxima, np.nan)
+    
+    @staticmethod
+    def _rows_by_cell(cells, rows, targets):
+        """Split grid rows into one ascending row array per target cell"""
+        order = np.argsort(cells, kind='stable')
+        bounds = np.searchsorted(cells[order], targets, side='left')
+        ends = np.searchsorted(cells[order], targets, side='right')
+        return [rows[order[start:end]] for start, end in zip(bounds, ends)]
+    
+    def _build_profile(self, kind):
+        """Aggregate the whole grid into one seasonal profile"""
+        n_cells = 24 * config.SEASONAL_PROFILES[kind]
+        cells = self._profile_cells(kind, 0, len(self.grid_values))
+        quantiles, maxima = self._cell_extremes(cells, self.grid_values, np.arange(n_cells))
+        
+        self.profiles[kind] = {
+            'rows': self._rows_by_cell(cells, np.arange(len(cells)), np.arange(n_cells)),
+            'sum': np.bincount(cells, weights=self.grid_values, minlength=n_cells),
+            'count': np.bincount(cells, minlength=n_cells),
+            'p95': quantiles,
+            'max': maxima
+        }
+    
+    def _update_profiles(self, lo, replaced):
+        """
+        Fold recomputed grid rows lo.. into the profiles that were built
+        
+        Sums and counts are adjusted with bincount (removing the replaced
+        values first). Each profile keeps the grid rows of every cell, so
+        quantiles and maxima are recomputed from the rows of the cells the
+        new rows fall into only.
+        
+        Args:
+            lo: First grid row that was recomputed
+            replaced: Previous values of grid rows lo.. (may be shorter)
+        """
+        for kind, profile in self.profiles.items():
+            n_cells = len(profile['sum'])
+            old_cells = self._profile_cells(kind, lo, lo + len(replaced))
+            new_cells = self._profile_cells(kind, lo, len(self.grid_values))
+            
+            profile['sum'] += (np.bincount(new_cells, weights=self.grid_values[lo:], minlength=n_cells)
+                               - np.bincount(old_cells, weights=replaced, minlength=n_cells))
+            profile['count'] += (np.bincount(new_cells, minlength=n_cells)
+                                 - np.bincount(old_cells, minlength=n_cells))
+            
+            # Rows lo.. are the tail of each touched cell's ascending row list
+            touched = np.unique(new_cells)
+            added = self._rows_by_cell(new_cells, lo + np.arange(len(new_cells)), touched)
+            for cell, new_rows in zip(touched, added):
+                kept = profile['rows'][cell]
+                profile['rows'][cell] = np.concatenate([kept[:np.searchsorted(kept, lo)], new_rows])
+            
+            cell_rows = [profile['rows'][cell] for cell in touched]
+            rows = np.concatenate(cell_rows)
+            cells = np.repeat(touched, [len(r) for r in cell_rows])
+            quantiles, maxima = self._cell_extremes(cells, self.grid_values[rows], touched)
+            profile['p95'][touched] = quantiles
+            profile['max'][touched] = maxima
+    
+    def get_seasonal_profile(self, kind='hour_weekday', stat='mean'):
+        """
+        Get a seasonal load profile matrix
+        
+        The first call aggregates the whole hourly grid in one pass; later
+        appends update the profile incrementally.
+        
+        Args:
+            kind: 'hour_weekday' (24 x 7) or 'hour_dayofyear' (24 x 366)
+            stat: 'mean', 'p95' or 'max'
+            
+        Returns:
+            numpy array with one row per hour of day (NaN where there is no
+            data), or None if the data is not on the hourly grid
+        """
+        if kind not in config.SEASONAL_PROFILES:
+            raise ValueError(f"Unknown profile: {kind}")
+        if stat not in ('mean', 'p95', 'max'):
+            raise ValueError(f"Unknown profile statistic: {stat}")
+        if self.grid_start is None:
+            return None
+        
+        if kind not in self.profiles:
+            self._build_profile(kind)
+        profile = self.profiles[kind]
+        
+        if stat == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = profile['sum'] / profile['count']
+        else:
+            values = profile[stat]
+        
+        return values.reshape(24, config.SEASONAL_PROFILES[kind])
+    
+    def get_quality_report(self):
+        """Get the data quality report from grid normalization"""
+        return self.quality_report
+    
+    def _feature_cache_key(self):
+        """
+        Name of the feature cache for the current data source and feature schema
+        
+        Returns:
+            Hex key, or None if the features cannot be cached
+        """
+        if not config.FEATURE_CACHE_DIR or self.df is None or len(self.df) == 0:
+            return None
+        
+        source = self.storage.path if self.storage is not None else config.DATASET_FILE
+        parts = [os.path.abspath(source), str(config.FEATURE_SCHEMA_VERSION), ','.join(self.feature_columns)]
+        
+        if self.exogenous is not None:
+            sources = [self.exogenous.temperature_file, self.exogenous.holiday_file]
+            if not any(sources):
+                return None  # Attached from shared memory, nothing to key on
+            parts.append(str(config.EXOGENOUS_TOLERANCE_HOURS))
+            for path in sources:
+                if path and os.path.exists(path):
+                    stat = os.stat(path)
+                    parts.append(f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}")
+        
+        return hashlib.blake2b('|'.join(parts).encode(), digest_size=8).hexdigest()
+    
+    @staticmethod
+    def _hash_rows(ns, load):
+        """Content hash of reading timestamps and loads"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(ns).tobytes())
+        digest.update(np.ascontiguousarray(load).tobytes())
+        return digest.hexdigest()
+    
+    def _compute_features(self, times):
+        """Feature matrix for a batch of timestamps, columns in self.feature_columns order"""
+        features = calendar_features(times)
+        if self.exogenous is not None:
+            features.update(self.exogenous.align(times))
+        return np.column_stack([features[c] for c in self.feature_columns]).astype(float)
+    
+    @staticmethod
+    def _write_npy(path, array):
+        """Write an .npy file atomically"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _append_npy(path, rows, old_rows):
+        """
+        Append rows to an .npy file in place
+        
+        numpy pads .npy headers so the first dimension can grow without
+        changing the header size, so the data is appended after the old
+        rows and only the shape in the header is rewritten.
+        """
+        with open(path, 'r+b') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            header_size = f.tell()
+            
+            if fortran_order or dtype != rows.dtype or shape[0] < old_rows or shape[1:] != rows.shape[1:]:
+                raise ValueError(f"Feature cache {path} does not match the new rows")
+            
+            row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+            f.seek(header_size + old_rows * row_bytes)
+            f.write(np.ascontiguousarray(rows).tobytes())
+            f.truncate()
+            
+            f.seek(0)
+            header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                      'shape': (old_rows + len(rows),) + shape[1:]}
+            if version == (1, 0):
+                np.lib.format.write_array_header_1_0(f, header)
+            else:
+                np.lib.format.write_array_header_2_0(f, header)
+            if f.tell() != header_size:
+                raise ValueError(f"Feature cache {path} header cannot grow in place")
+    
+    @staticmethod
+    @contextmanager
+    def _cache_lock(path):
+        """Hold an exclusive lock on path while the feature cache is checked and written"""
+        with open(path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _sync_feature_cache(self, key):
+        """
+        Bring the on-disk feature cache up to date and map it
+        
+        The cache holds the feature matrix, target and timestamps as .npy
+        files in config.FEATURE_CACHE_DIR plus a manifest with the number of
+        cached rows and their content hash. If the cached rows are still a
+        prefix of the loaded data only the new rows are computed and
+        appended; if the loaded data is a prefix of a longer cache the cache
+        is used as is; any other change rebuilds the cache. Processes and
+        threads sharing the cache take a lock file around the check and
+        the writes.
+        
+        Args:
+            key: Cache name from _feature_cache_key
+            
+        Returns:
+            Tuple of (X, y) read-only memory-mapped arrays
+        """
+        base = os.path.join(config.FEATURE_CACHE_DIR, key)
+        x_path, y_path, t_path = f"{base}.X.npy", f"{base}.y.npy", f"{base}.t.npy"
+        manifest_path = f"{base}.json"
+        
+        ns = self.df[config.DATETIME_COL].to_numpy('datetime64[ns]').view('int64')
+        load = self.df[config.ENERGY_COL].to_numpy(dtype=float)
+        n_rows = len(ns)
+        
+        os.makedirs(config.FEATURE_CACHE_DIR, exist_ok=True)
+        with self._cache_lock(f"{base}.lock"):
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = None
+            
+            files_exist = all(os.path.exists(path) for path in (x_path, y_path, t_path))
+            
+            # Rows already in the cache, if they still match the loaded data
+            cached = 0
+            if manifest is not None and files_exist:
+                if manifest['rows'] <= n_rows:
+                    if self._hash_rows(ns[:manifest['rows']], load[:manifest['rows']]) == manifest['hash']:
+                        cached = manifest['rows']
+                else:
+                    # A longer cache serves a prefix of its rows unchanged
+                    cached_times = np.load(t_path, mmap_mode='r')[:n_rows]
+                    cached_load = np.load(y_path, mmap_mode='r')[:n_rows]
+                    if np.array_equal(cached_times, ns) and np.array_equal(cached_load, load):
+                        cached = n_rows
+            
+            if cached < n_rows:
+                if cached == 0:
+                    self._write_npy(x_path, self._compute_features(self.df[config.DATETIME_COL]))
+                    self._write_npy(y_path, load)
+                    self._write_npy(t_path, ns)
+                    print(f"ℹ Feature cache built: {n_rows} rows")
+                else:
+                    new_times = self.df[config.DATETIME_COL].iloc[cached:]
+                    self._append_npy(x_path, self._compute_features(new_times), cached)
+                    self._append_npy(y_path, load[cached:], cached)
+                    self._append_npy(t_path, ns[cached:], cached)
+                    print(f"ℹ Feature cache extended: {n_rows - cached} new rows")
+                
+                tmp_path = f"{manifest_path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump({'rows': n_rows, 'hash': self._hash_rows(ns, load),
+                               'columns': self.feature_columns}, f)
+                os.replace(tmp_path, manifest_path)
+            
+            X = np.load(x_path, mmap_mode='r')[:n_rows]
+            y = np.load(y_path, mmap_mode='r')[:n_rows]
+        
+        return X, y
+    
+    @profiled
     def prepare_features(self):
         """Extract features from datetime for machine learning"""
         try:
-            # Create a copy for processing
-            self.processed_df = self.df.copy()
-            
-            # Extract time-based features
-            self.processed_df['year'] = self.processed_df[config.DATETIME_COL].dt.year
-            self.processed_df['month'] = self.processed_df[config.DATETIME_COL].dt.month
-            self.processed_df['day'] = self.processed_df[config.DATETIME_COL].dt.day
-            self.processed_df['hour'] = self.processed_df[config.DATETIME_COL].dt.hour
-            self.processed_df['day_of_week'] = self.processed_df[config.DATETIME_COL].dt.dayofweek
-            self.processed_df['day_of_year'] = self.processed_df[config.DATETIME_COL].dt.dayofyear
-            
-            # Create cyclical features for hour and month (better for ML)
-            self.processed_df['hour_sin'] = np.sin(2 * np.pi * self.processed_df['hour'] / 24)
-            self.processed_df['hour_cos'] = np.cos(2 * np.pi * self.processed_df['hour'] / 24)
-            self.processed_df['month_sin'] = np.sin(2 * np.pi * self.processed_df['month'] / 12)
-            self.processed_df['month_cos'] = np.cos(2 * np.pi * self.processed_df['month'] / 12)
+            # Map the features from the cache instead of recomputing them
+            key = self._feature_cache_key()
+            if key is not None:
+                self.feature_matrix, self.target = self._sync_feature_cache(key)
+                self.processed_df = pd.DataFrame(self.feature_matrix,
+                                                 columns=self.feature_columns, copy=False)
+                self.processed_df[config.ENERGY_COL] = self.target
+                print("✓ Features prepared successfully")
+                return True
+            
+            # Compute the features directly when the cache is disabled
+            self.processed_df = pd.DataFrame(self._compute_features(self.df[config.DATETIME_COL]),
+                                             columns=self.feature_columns)
+            self.processed_df[config.ENERGY_COL] = self.df[config.ENERGY_COL].to_numpy(dtype=float)
             
             print("✓ Features prepared successfully")
             return True
@@ -66,6 +656,133 @@ class DataManager:
             print(f"✗ Error preparing features: {str(e)}")
             return False
     
+    def publish_shared(self, store=None):
+        """
+        Publish the loaded data to shared memory for worker processes
+        
+        Args:
+            store: SharedArrayStore to publish to (created if not given)
+            
+        Returns:
+            The SharedArrayStore, or None on error
+        """
+        if self.df is None:
+            print("✗ Load data before publishing it")
+            return None
+        
+        if store is None:
+            store = SharedArrayStore(f"{config.SHARED_STORE_NAME}_data")
+        
+        try:
+            arrays = {
+                'timestamps': self.df[config.DATETIME_COL].to_numpy('datetime64[ns]').view('int64'),
+                'load': self.df[config.ENERGY_COL].to_numpy(dtype=float)
+            }
+            
+            meta = {}
+            
+            # The grid origin and counts let workers build day matrices,
+            # seasonal profiles and reports from the shared load
+            if self.grid_start is not None:
+                arrays['grid_counts'] = self.grid_counts
+                meta['grid_start'] = int(self.grid_start.value)
+                meta['quality_report'] = {name: str(value) if isinstance(value, pd.Timestamp) else value
+                                          for name, value in self.quality_report.items()}
+            
+            # Derived features are shared too so workers skip prepare_features,
+            # as long as they still describe the loaded rows
+            if self.processed_df is not None and len(self.processed_df) == len(self.df):
+                arrays['features'] = self.processed_df[self.feature_columns].to_numpy(dtype=float)
+            
+            # Exogenous series go along so workers can build forecast features
+            if self.exogenous is not None:
+                arrays.update(self.exogenous.to_arrays())
+            
+            store.publish(arrays, meta)
+            return store
+            
+        except Exception as e:
+            print(f"✗ Error publishing data: {str(e)}")
+            return None
+    
+    def attach_shared(self, store=None):
+        """
+        Use data published by a loader process instead of reading the CSV
+        
+        The data frames wrap read-only views of the shared arrays, so no
+        per-worker copy of the dataset is made. The hourly grid is restored
+        from the published origin and counts, so day matrices, seasonal
+        profiles and reports work on attached data. After store.refresh()
+        returns True, call this again to pick up the new version.
+        
+        Args:
+            store: Attached SharedArrayStore (attached here if not given)
+            
+        Returns:
+            The SharedArrayStore, or None if nothing is published
+        """
+        if store is None:
+            store = SharedArrayStore(f"{config.SHARED_STORE_NAME}_data")
+            if not store.attach():
+                return None
+        
+        arrays = store.arrays
+        timestamps = arrays['timestamps'].view('datetime64[ns]')
+        
+        self.df = pd.DataFrame({
+            config.DATETIME_COL: timestamps,
+            config.ENERGY_COL: arrays['load']
+        }, copy=False)
+        
+        # Restore the hourly grid around the shared load
+        self.grid_start = None
+        self.grid_sums = self.grid_counts = self.grid_values = self.grid_mask = None
+        self.quality_report = None
+        self.profiles = {}
+        if 'grid_start' in store.meta:
+            self.grid_start = pd.Timestamp(store.meta['grid_start'])
+            self.grid_values = arrays['load']
+            self.grid_counts = arrays['grid_counts']
+            self.grid_mask = self.grid_counts > 0
+            self.grid_sums = self.grid_values * self.grid_counts
+            self.quality_report = dict(store.meta['quality_report'])
+            for name in ('start', 'end'):
+                self.quality_report[name] = pd.Timestamp(self.quality_report[name])
+        
+        self.feature_matrix = None
+        self.target = None
+        self.exogenous = None
+        if 'temp_times' in arrays or 'holiday_days' in arrays:
+            self.exogenous = ExogenousData.from_arrays(arrays)
+        
+        self.processed_df = None
+        if 'features' in arrays:
+            self.processed_df = pd.DataFrame(arrays['features'],
+                                             columns=self.feature_columns, copy=False)
+            self.processed_df[config.ENERGY_COL] = arrays['load']
+        
+        print(f"✓ Attached to shared data: {len(self.df)} records (version {store.version})")
+        return store
+    
+    def start_profiling(self, calls=None, seconds=None, output_dir=None, memory=True):
+        """
+        Capture cProfile and tracemalloc reports for the next instrumented calls
+        
+        Args:
+            calls: Stop after this many calls (defaults to config.PROFILE_DEFAULT_CALLS)
+            seconds: Stop after this many seconds
+            output_dir: Report directory (defaults to config.PROFILE_OUTPUT_DIR)
+            memory: Also capture allocation reports
+            
+        Returns:
+            The running profiler.ProfileSession
+        """
+        return profiler.start(calls, seconds, output_dir, memory)
+    
+    def stop_profiling(self):
+        """End the profiling window early and write its reports (returns their paths)"""
+        return profiler.stop()
+    
     def get_current_usage(self):
         """Get the most recent energy usage data"""
         if self.df is None or len(self.df) == 0:
@@ -79,6 +796,7 @@ class DataManager:
             'cost': latest[config.ENERGY_COL] * 1000 * config.ENERGY_COST_PER_KWH
         }
     
+    @profiled
     def get_daily_stats(self, date=None):
         """Get statistics for a specific day"""
         if self.df is None:
@@ -88,7 +806,12 @@ class DataManager:
             date = self.df[config.DATETIME_COL].max().date()
         
         # Filter data for the specific date
-        daily_data = self.df[self.df[config.DATETIME_COL].dt.date == date]
+        if self.grid_start is not None:
+            # On the regular grid a day is a fixed 24-row slice
+            start = (pd.Timestamp(date).value - self.grid_start.value) // HOUR_NS
+            daily_data = self.df.iloc[max(start, 0):max(start + 24, 0)]
+        else:
+            daily_data = self.df[self.df[config.DATETIME_COL].dt.date == date]
         
         if len(daily_data) == 0:
             return None
@@ -102,6 +825,7 @@ class DataManager:
             'total_cost': daily_data[config.ENERGY_COL].sum() * 1000 * config.ENERGY_COST_PER_KWH
         }
     
+    @profiled
     def get_weekly_stats(self):
         """Get statistics for the last 7 days"""
         if self.df is None:
@@ -111,10 +835,14 @@ class DataManager:
         end_date = self.df[config.DATETIME_COL].max()
         start_date = end_date - timedelta(days=7)
         
-        weekly_data = self.df[
-            (self.df[config.DATETIME_COL] >= start_date) & 
-            (self.df[config.DATETIME_COL] <= end_date)
-        ]
+        if self.grid_start is not None:
+            # On the regular grid the window is the last 7 * 24 + 1 rows
+            weekly_data = self.df.iloc[-(7 * 24 + 1):]
+        else:
+            weekly_data = self.df[
+                (self.df[config.DATETIME_COL] >= start_date) & 
+                (self.df[config.DATETIME_COL] <= end_date)
+            ]
         
         if len(weekly_data) == 0:
             return None
@@ -133,11 +861,37 @@ class DataManager:
             'daily_data': daily_totals
         }
     
+    @profiled
+    def get_range_stats(self, start, end):
+        """
+        Get statistics for stored readings between two datetimes
+        
+        With the SQLite backend the aggregation runs inside the database.
+        
+        Returns:
+            Dictionary with count, total, mean, min and max
+        """
+        if self.storage is None:
+            self.storage = get_storage()
+        
+        return self.storage.range_stats(start, end)
+    
+    @profiled
     def get_hourly_pattern(self):
         """Get average energy consumption by hour of day"""
         if self.df is None:
             return None
         
+        # On the grid the hour x weekday profile already holds the totals
+        if self.grid_start is not None:
+            if 'hour_weekday' not in self.profiles:
+                self._build_profile('hour_weekday')
+            profile = self.profiles['hour_weekday']
+            sums = profile['sum'].reshape(24, -1).sum(axis=1)
+            counts = profile['count'].reshape(24, -1).sum(axis=1)
+            return pd.Series(sums / counts, index=pd.RangeIndex(24, name=config.DATETIME_COL),
+                             name=config.ENERGY_COL)
+        
         # Calculate average consumption for each hour
         hourly_avg = self.df.groupby(
             self.df[config.DATETIME_COL].dt.hour
@@ -145,16 +899,19 @@ class DataManager:
         
         return hourly_avg
     
+    @profiled
     def get_training_data(self):
         """Get prepared data for model training"""
+        if self.feature_matrix is not None:
+            # Zero-copy views of the memory-mapped feature cache
+            X = pd.DataFrame(self.feature_matrix, columns=self.feature_columns, copy=False)
+            y = pd.Series(self.target, name=config.ENERGY_COL, copy=False)
+            return X, y
+        
         if self.processed_df is None:
             return None, None
         
-        # Features for training
-        feature_cols = ['hour', 'day_of_week', 'month', 'day_of_year',
-                       'hour_sin', 'hour_cos', 'month_sin', 'month_cos']
-        
-        X = self.processed_df[feature_cols]
+        X = self.processed_df[self.feature_columns]
         y = self.processed_df[config.ENERGY_COL]
         
         return X, y
@@ -180,7 +937,8 @@ class DataManager:
             'energy_kwh': round(energy_kwh, 2),
             'cost': round(cost, 2)
         }
-            def get_date_range(self):
+    
+    def get_date_range(self):
         """Get the date range of the dataset"""
         if self.df is None:
             return None, None
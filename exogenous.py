@@ -0,0 +1,142 @@
+"""
+Exogenous Data Module
+Aligns temperature and holiday series to load timestamps for use as features
+"""
+
+import numpy as np
+import pandas as pd
+import config
+
+
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+
+class ExogenousData:
+    """Temperature and holiday series joined to timestamps with a sorted as-of join"""
+    
+    def __init__(self, temperature_file=None, holiday_file=None):
+        """
+        Load the exogenous series
+        
+        Args:
+            temperature_file: CSV with datetime and temperature columns
+                (defaults to config.TEMPERATURE_FILE)
+            holiday_file: CSV with a date column, one holiday per row
+                (defaults to config.HOLIDAY_FILE)
+        """
+        self.temperature_file = temperature_file or config.TEMPERATURE_FILE
+        self.holiday_file = holiday_file or config.HOLIDAY_FILE
+        
+        self.temp_times = None
+        self.temp_values = None
+        self.temp_climatology = None
+        self.holiday_days = None
+        
+        if self.temperature_file:
+            self._load_temperature(self.temperature_file)
+        if self.holiday_file:
+            self._load_holidays(self.holiday_file)
+    
+    @property
+    def columns(self):
+        """Feature columns this data provides"""
+        columns = []
+        if self.temp_times is not None:
+            columns.append('temperature')
+        if self.holiday_days is not None:
+            columns.append('is_holiday')
+        return columns
+    
+    def to_arrays(self):
+        """Get the loaded series as plain arrays (for shared memory)"""
+        arrays = {}
+        if self.temp_times is not None:
+            arrays['temp_times'] = self.temp_times
+            arrays['temp_values'] = self.temp_values
+            arrays['temp_climatology'] = self.temp_climatology
+        if self.holiday_days is not None:
+            arrays['holiday_days'] = self.holiday_days
+        return arrays
+    
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild from arrays produced by to_arrays without reading any files"""
+        exogenous = cls.__new__(cls)
+        exogenous.temperature_file = None
+        exogenous.holiday_file = None
+        exogenous.temp_times = arrays.get('temp_times')
+        exogenous.temp_values = arrays.get('temp_values')
+        exogenous.temp_climatology = arrays.get('temp_climatology')
+        exogenous.holiday_days = arrays.get('holiday_days')
+        return exogenous
+    
+    def _load_temperature(self, path):
+        """Read hourly temperatures and build a (month, hour) climatology fallback"""
+        frame = pd.read_csv(path)
+        times = pd.to_datetime(frame[config.DATETIME_COL]).to_numpy('datetime64[ns]').view('int64')
+        values = frame[config.TEMPERATURE_COL].to_numpy(dtype=float)
+        
+        valid = ~np.isnan(values)
+        if not valid.any():
+            # Nothing to join or average; leave the temperature column out
+            print(f"ℹ No temperature readings in {path}")
+            return
+        
+        order = np.argsort(times[valid], kind='stable')
+        self.temp_times = times[valid][order]
+        self.temp_values = values[valid][order]
+        
+        # Mean temperature per (month, hour) for timestamps the file does not cover
+        stamps = pd.DatetimeIndex(self.temp_times)
+        slots = (stamps.month.to_numpy() - 1) * 24 + stamps.hour.to_numpy()
+        sums = np.bincount(slots, weights=self.temp_values, minlength=12 * 24)
+        counts = np.bincount(slots, minlength=12 * 24)
+        overall = self.temp_values.mean() if len(self.temp_values) else 0.0
+        self.temp_climatology = np.where(counts > 0, sums / np.maximum(counts, 1), overall)
+    
+    def _load_holidays(self, path):
+        """Read the holiday calendar as sorted day numbers"""
+        frame = pd.read_csv(path)
+        days = pd.to_datetime(frame[config.HOLIDAY_DATE_COL]).to_numpy('datetime64[ns]').view('int64') // DAY_NS
+        self.holiday_days = np.unique(days)
+    
+    def align(self, times):
+        """
+        Join the exogenous series to timestamps
+        
+        Temperature uses the latest reading at or before each timestamp (within
+        config.EXOGENOUS_TOLERANCE_HOURS), found with one searchsorted over the
+        sorted readings; timestamps without a recent reading, such as a future
+        forecast horizon, get the (month, hour) climatology.
+        
+        Args:
+            times: Sequence of timestamps
+        
+        Returns:
+            Dictionary of column name -> numpy array aligned with times
+        """
+        stamps = pd.DatetimeIndex(times)
+        ns = stamps.to_numpy('datetime64[ns]').view('int64')
+        aligned = {}
+        
+        if self.temp_times is not None:
+            climatology = self.temp_climatology[(stamps.month.to_numpy() - 1) * 24 + stamps.hour.to_numpy()]
+            
+            if len(self.temp_times):
+                idx = np.searchsorted(self.temp_times, ns, side='right') - 1
+                safe_idx = np.maximum(idx, 0)
+                tolerance = config.EXOGENOUS_TOLERANCE_HOURS * HOUR_NS
+                matched = (idx >= 0) & (ns - self.temp_times[safe_idx] <= tolerance)
+                
+                aligned['temperature'] = np.where(matched, self.temp_values[safe_idx], climatology)
+            else:
+                aligned['temperature'] = climatology
+        
+        if self.holiday_days is not None:
+            days = ns // DAY_NS
+            pos = np.minimum(np.searchsorted(self.holiday_days, days), max(len(self.holiday_days) - 1, 0))
+            is_holiday = (self.holiday_days[pos] == days) if len(self.holiday_days) else np.zeros(len(days), bool)
+            aligned['is_holiday'] = is_holiday.astype(float)
+        
+        return aligned
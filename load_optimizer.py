@@ -0,0 +1,178 @@
+"""
+Load Optimizer Module
+Schedules flexible device runs into cheap or low-load time slots
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import config
+
+
+class LoadShiftOptimizer:
+    """Greedy peak-shaving / load-shifting scheduler for flexible devices"""
+    
+    def __init__(self, devices=None, base_price=None):
+        """
+        Initialize the optimizer
+        
+        Args:
+            devices: Flexible device settings (defaults to config.FLEXIBLE_DEVICES)
+            base_price: Average energy price per kWh (defaults to config.ENERGY_COST_PER_KWH)
+        """
+        self.devices = devices or config.FLEXIBLE_DEVICES
+        self.base_price = base_price or config.ENERGY_COST_PER_KWH
+    
+    def price_signal(self, forecast):
+        """
+        Build a time-of-use price from the grid load forecast
+        
+        The price follows the forecast shape and averages to the base price,
+        so hours with high predicted grid load are the most expensive.
+        
+        Args:
+            forecast: Grid load forecast, shape (hours,) or (households, hours)
+        
+        Returns:
+            Price per kWh with the same shape as the forecast
+        """
+        forecast = np.asarray(forecast, dtype=float)
+        return self.base_price * forecast / forecast.mean(axis=-1, keepdims=True)
+    
+    def _allowed_starts(self, settings, n_hours):
+        """Mask of slots where a run may start (slot 0 is midnight)"""
+        hour_of_day = np.arange(n_hours) % 24
+        return ((hour_of_day >= settings['earliest']) &
+                (hour_of_day + settings['duration'] <= settings['latest']))
+    
+    def schedule(self, forecast, base_load=None, objective='cost'):
+        """
+        Schedule one run per day of every flexible device for a batch of households
+        
+        Devices are placed greedily, largest first. For each device the score
+        of every start slot is computed for all households and days at once
+        (window sums for cost, window maxima for peak), and the best slot per
+        day is picked with a single argmin.
+        
+        Args:
+            forecast: Grid load forecast starting at midnight, shape (hours,) or
+                (households, hours); hours must be a multiple of 24
+            base_load: Non-flexible household load in kW, shape (households, hours);
+                defaults to the forecast shape scaled to config.HOUSEHOLD_BASE_LOAD_KW
+            objective: 'cost' to minimize energy cost, 'peak' to minimize the
+                household peak load
+        
+        Returns:
+            Dictionary with per-device start slots (households, days), the
+            resulting cost and peak per household and the cost of running
+            every device at the start of its window
+        """
+        if objective not in ('cost', 'peak'):
+            raise ValueError(f"Unknown objective: {objective}")
+        
+        forecast = np.atleast_2d(np.asarray(forecast, dtype=float))
+        n_hours = forecast.shape[1]
+        if n_hours % 24 != 0:
+            raise ValueError("Forecast horizon must be a whole number of days")
+        
+        if base_load is None:
+            base_load = (config.HOUSEHOLD_BASE_LOAD_KW * forecast /
+                         forecast.mean(axis=1, keepdims=True))
+        load = np.array(np.broadcast_to(base_load, np.broadcast_shapes(
+            np.shape(base_load), forecast.shape)), dtype=float)
+        
+        n_households = load.shape[0]
+        n_days = n_hours // 24
+        price = np.broadcast_to(self.price_signal(forecast), load.shape)
+        price_cumsum = np.concatenate([np.zeros((price.shape[0], 1)),
+                                       np.cumsum(price, axis=1)], axis=1)
+        
+        rows = np.arange(n_households)[:, None, None]
+        day_offsets = np.arange(n_days)[None, :] * 24
+        
+        starts = {}
+        flexible_cost = np.zeros(n_households)
+        naive_cost = np.zeros(n_households)
+        
+        # Largest devices first so they get the best slots
+        order = sorted(self.devices, key=lambda name: -config.DEVICES[name])
+        
+        for name in order:
+            settings = self.devices[name]
+            duration = settings['duration']
+            power_kw = config.DEVICES[name] / 1000
+            n_starts = n_hours - duration + 1
+            
+            # Cost of a run starting at each slot: one window sum per slot
+            window_price = price_cumsum[:, duration:] - price_cumsum[:, :n_starts]
+            run_cost = np.broadcast_to(window_price * power_kw, (n_households, n_starts))
+            
+            if objective == 'cost':
+                score = run_cost
+            else:
+                # Peak after adding the device; cost breaks ties
+                window_max = sliding_window_view(load, duration, axis=1).max(axis=-1)
+                score = window_max + power_kw + 1e-6 * run_cost
+            
+            # Pad to whole days, block forbidden slots and pick the best per day
+            padded = np.full((n_households, n_hours), np.inf)
+            padded[:, :n_starts] = score
+            padded[:, ~self._allowed_starts(settings, n_hours)] = np.inf
+            best = padded.reshape(n_households, n_days, 24).argmin(axis=2) + day_offsets
+            
+            # Add the chosen runs to the household load
+            run_slots = best[:, :, None] + np.arange(duration)
+            load[rows, run_slots] += power_kw
+            
+            starts[name] = best
+            flexible_cost += np.take_along_axis(run_cost, best, axis=1).sum(axis=1)
+            
+            # Reference: run as soon as the window opens every day
+            naive_start = settings['earliest'] + day_offsets[0]
+            naive_cost += run_cost[:, naive_start].sum(axis=1)
+        
+        return {
+            'starts': starts,
+            'cost': flexible_cost,
+            'naive_cost': naive_cost,
+            'savings': naive_cost - flexible_cost,
+            'peak_kw': load.max(axis=1),
+            'load_kw': load
+        }
+    
+    def plan_household(self, predictor, start_date, days=1, objective='cost'):
+        """
+        Build a readable device plan for one household from the model forecast
+        
+        Args:
+            predictor: Trained EnergyPredictor
+            start_date: First day of the plan (the plan starts at midnight)
+            days: Number of days to plan (1-7)
+            objective: 'cost' or 'peak'
+        
+        Returns:
+            List of dictionaries with device, start, end and cost, sorted by start
+        """
+        start = pd.Timestamp(start_date).normalize()
+        times = start + pd.to_timedelta(np.arange(days * 24), unit='h')
+        forecast = predictor.predict_batch(times)
+        if forecast is None:
+            return None
+        
+        result = self.schedule(forecast, objective=objective)
+        price = self.price_signal(forecast)
+        
+        plan = []
+        for name, slots in result['starts'].items():
+            duration = self.devices[name]['duration']
+            power_kw = config.DEVICES[name] / 1000
+            for slot in slots[0]:
+                plan.append({
+                    'device': name,
+                    'start': times[slot],
+                    'end': times[slot] + pd.Timedelta(hours=duration),
+                    'energy_kwh': round(power_kw * duration, 2),
+                    'cost': round(float(price[slot:slot + duration].sum()) * power_kw, 2)
+                })
+        
+        return sorted(plan, key=lambda run: run['start'])
@@ -0,0 +1,328 @@
+"""
+Command Line Interface
+Headless entry point for ingesting data, training, bulk forecasts and reports
+
+Usage:
+    python main.py ingest [--file dataset.csv]
+    python main.py train [--model-type segmented] [--temperature temps.csv] [--holidays holidays.csv]
+    python main.py search
+    python main.py forecast --start 2018-08-03 --horizon 8760 --out forecast.csv
+    python main.py report --type Monthly --out monthly.jsonl
+    python main.py bench
+"""
+
+import argparse
+import os
+import sys
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+import config
+
+
+class ChunkWriter:
+    """Writes DataFrame chunks to CSV, JSONL or Parquet without holding them all"""
+    
+    FORMATS = ('csv', 'jsonl', 'parquet')
+    
+    def __init__(self, path, fmt=None):
+        """
+        Open the output file
+        
+        Args:
+            path: Output file path
+            fmt: 'csv', 'jsonl' or 'parquet' (inferred from the extension if omitted)
+        """
+        self.path = path
+        self.format = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unsupported output format: {self.format}")
+        
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+        
+        if self.format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+        else:
+            self._file = open(path, 'w', newline='')
+    
+    def write(self, chunk):
+        """Append one DataFrame chunk"""
+        if self.format == 'csv':
+            chunk.to_csv(self._file, header=self.rows == 0, index=False)
+        elif self.format == 'jsonl':
+            lines = chunk.to_json(orient='records', lines=True, date_format='iso')
+            if lines and not lines.endswith('\n'):
+                lines += '\n'
+            self._file.write(lines)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        
+        self.rows += len(chunk)
+    
+    def close(self):
+        """Flush and close the output file"""
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def open_writer(path, fmt=None):
+    """Open a ChunkWriter, reporting unsupported formats instead of raising"""
+    try:
+        return ChunkWriter(path, fmt)
+    except (ImportError, ValueError) as e:
+        print(f"✗ Cannot write {path}: {str(e)}")
+        return None
+
+
+_worker_predictor = None
+
+
+def _init_forecast_worker(model_file):
+    """Load the model once per worker process"""
+    global _worker_predictor
+    from predictor import EnergyPredictor
+    
+    _worker_predictor = EnergyPredictor()
+    _worker_predictor.load_model(model_file)
+
+
+def _forecast_chunk(task):
+    """Forecast one slice of the horizon in a worker process"""
+    start, n_hours = task
+    times = pd.Timestamp(start) + pd.to_timedelta(np.arange(n_hours), unit='h')
+    predictions, lower, upper = _worker_predictor.predict_interval(times)
+    if predictions is None:
+        raise RuntimeError(f"Forecast worker has no usable model (chunk starting {start})")
+    
+    return pd.DataFrame({
+        config.DATETIME_COL: times,
+        'prediction': predictions,
+        'lower': lower,
+        'upper': upper
+    })
+
+
+def cmd_ingest(args):
+    """Import a CSV file into the SQLite store"""
+    from storage import SQLiteStorage
+    
+    storage = SQLiteStorage(args.db)
+    written = storage.import_csv(args.file, args.series)
+    storage.close()
+    return 0 if written else 1
+
+
+def cmd_train(args):
+    """Train the model on the stored data and save it"""
+    from data_manager import DataManager
+    from predictor import EnergyPredictor
+    
+    data_manager = DataManager()
+    if not data_manager.load_data():
+        return 1
+    if args.temperature or args.holidays:
+        data_manager.load_exogenous(args.temperature, args.holidays)
+    if not data_manager.prepare_features():
+        return 1
+    
+    X, y = data_manager.get_training_data()
+    predictor = EnergyPredictor(args.model_type)
+    if not predictor.train_model(X, y, data_manager.exogenous):
+        return 1
+    
+    return 0 if predictor.save_model(args.model_file) else 1
+
+
+def cmd_search(args):
+    """Search ridge penalties and feature subsets and save the best configuration"""
+    from data_manager import DataManager
+    from model_search import RidgeSearch
+    
+    data_manager = DataManager()
+    if not data_manager.load_data():
+        return 1
+    if args.temperature or args.holidays:
+        data_manager.load_exogenous(args.temperature, args.holidays)
+    if not data_manager.prepare_features():
+        return 1
+    
+    X, y = data_manager.get_training_data()
+    search = RidgeSearch(n_folds=args.folds)
+    results = search.fit(X, y)
+    print(results.head(args.top).to_string(index=False))
+    
+    return 0 if search.save(args.out) else 1
+
+
+def cmd_forecast(args):
+    """Forecast an hourly horizon in parallel and stream it to a file"""
+    from predictor import EnergyPredictor
+    
+    # Fail before starting workers if the model cannot be loaded
+    if not EnergyPredictor().load_model(args.model_file):
+        return 1
+    
+    start = pd.Timestamp(args.start)
+    chunk = args.chunk_hours
+    tasks = [(start + pd.Timedelta(hours=offset), min(chunk, args.horizon - offset))
+             for offset in range(0, args.horizon, chunk)]
+    
+    writer = open_writer(args.out, args.format)
+    if writer is None:
+        return 1
+    
+    try:
+        with Pool(args.workers, initializer=_init_forecast_worker,
+                  initargs=(args.model_file,)) as pool:
+            # imap keeps results in order and only buffers chunks still in flight
+            for result in pool.imap(_forecast_chunk, tasks):
+                writer.write(result)
+    except RuntimeError as e:
+        print(f"✗ Forecast failed: {str(e)}")
+        return 1
+    finally:
+        writer.close()
+    
+    print(f"✓ Wrote {writer.rows} forecast rows to {args.out}")
+    return 0
+
+
+def cmd_report(args):
+    """Write per-period energy statistics and/or export report charts"""
+    from data_manager import DataManager
+    from report_generator import ReportGenerator
+    
+    if args.out is None and args.charts is None:
+        print("✗ Give --out for statistics and/or --charts for report charts")
+        return 1
+    
+    data_manager = DataManager()
+    if not data_manager.load_data():
+        return 1
+    
+    # Charts and statistics come from the same aggregation of the day matrix
+    report_generator = ReportGenerator(data_manager)
+    
+    try:
+        if args.charts is not None:
+            exported = report_generator.export(args.type, args.start, args.end,
+                                               args.charts, args.chart_format, args.workers)
+            if args.out is None:
+                return 0 if exported['reports'] else 1
+        
+        stats = report_generator.period_stats(args.type, args.start, args.end)
+    except ValueError as e:
+        print(f"✗ Report failed: {str(e)}")
+        return 1
+    
+    if len(stats) == 0:
+        print("✗ No whole days of data in the selected range")
+        return 1
+    
+    writer = open_writer(args.out, args.format)
+    if writer is None:
+        return 1
+    
+    try:
+        for offset in range(0, len(stats), args.chunk_rows):
+            writer.write(stats.iloc[offset:offset + args.chunk_rows])
+    finally:
+        writer.close()
+    
+    print(f"✓ Wrote {writer.rows} {args.type.lower()} report rows to {args.out}")
+    return 0
+
+
+def cmd_bench(args):
+    """Run the built-in benchmarks"""
+    import benchmarks
+    
+    benchmarks.bench_storage(args.queries)
+    benchmarks.bench_forecast(args.horizon)
+    return 0
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(description=config.WINDOW_TITLE)
+    subparsers = parser.add_subparsers(dest='command')
+    
+    ingest = subparsers.add_parser('ingest', help='Import a CSV file into the SQLite store')
+    ingest.add_argument('--file', default=config.DATASET_FILE)
+    ingest.add_argument('--series', default=None, help='Import only this column')
+    ingest.add_argument('--db', default=config.SQLITE_FILE)
+    ingest.set_defaults(func=cmd_ingest)
+    
+    train = subparsers.add_parser('train', help='Train and save the prediction model')
+    train.add_argument('--model-type', choices=['linear', 'segmented', 'ridge'], default=None)
+    train.add_argument('--model-file', default=config.MODEL_FILE)
+    train.add_argument('--temperature', default=None, help='Hourly temperature CSV')
+    train.add_argument('--holidays', default=None, help='Holiday calendar CSV')
+    train.set_defaults(func=cmd_train)
+    
+    search = subparsers.add_parser('search', help='Search ridge penalties and feature subsets')
+    search.add_argument('--folds', type=int, default=config.SEARCH_FOLDS)
+    search.add_argument('--top', type=int, default=10, help='Number of results to print')
+    search.add_argument('--out', default=config.SEARCH_RESULT_FILE)
+    search.add_argument('--temperature', default=None, help='Hourly temperature CSV')
+    search.add_argument('--holidays', default=None, help='Holiday calendar CSV')
+    search.set_defaults(func=cmd_search)
+    
+    forecast = subparsers.add_parser('forecast', help='Forecast an hourly horizon to a file')
+    forecast.add_argument('--start', required=True, help='First forecast hour')
+    forecast.add_argument('--horizon', type=int, default=config.PREDICTION_DAYS * 24,
+                          help='Number of hours to forecast')
+    forecast.add_argument('--out', required=True)
+    forecast.add_argument('--format', choices=ChunkWriter.FORMATS, default=None)
+    forecast.add_argument('--workers', type=int, default=os.cpu_count())
+    forecast.add_argument('--chunk-hours', type=int, default=config.CLI_CHUNK_HOURS)
+    forecast.add_argument('--model-file', default=config.MODEL_FILE)
+    forecast.set_defaults(func=cmd_forecast)
+    
+    report = subparsers.add_parser('report', help='Write Daily/Weekly/Monthly statistics')
+    report.add_argument('--type', choices=config.REPORT_TYPES, default='Daily')
+    report.add_argument('--start', default=None)
+    report.add_argument('--end', default=None)
+    report.add_argument('--out', default=None, help='Statistics output file')
+    report.add_argument('--format', choices=ChunkWriter.FORMATS, default=None)
+    report.add_argument('--chunk-rows', type=int, default=1000)
+    report.add_argument('--charts', default=None, help='Directory for report charts')
+    report.add_argument('--chart-format', choices=['png', 'svg', 'html'],
+                        default=config.REPORT_CHART_FORMAT)
+    report.add_argument('--workers', type=int, default=os.cpu_count())
+    report.set_defaults(func=cmd_report)
+    
+    bench = subparsers.add_parser('bench', help='Run storage and forecast benchmarks')
+    bench.add_argument('--queries', type=int, default=100)
+    bench.add_argument('--horizon', type=int, default=365 * 24)
+    bench.set_defaults(func=cmd_bench)
+    
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.command is None:
+        parser.print_help()
+        return 0
+    
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Model Search Module
+Ridge penalty and feature subset search from one pass over the training data
+"""
+
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import config
+
+
+class RidgeSearch:
+    """
+    Cross-validated search over ridge penalties and feature subsets
+    
+    The data is read once to build the augmented Gram matrix [X, y, 1]ᵀ[X, y, 1]
+    of every validation fold. Training and validation statistics of any fold
+    and any feature subset are slices and differences of those small matrices,
+    so each subset costs one eigendecomposition per fold and every penalty on
+    the path is evaluated from it in closed form.
+    """
+    
+    def __init__(self, alphas=None, n_folds=None):
+        """
+        Initialize the search
+        
+        Args:
+            alphas: Ridge penalties to try (defaults to config.SEARCH_ALPHAS)
+            n_folds: Number of contiguous validation folds (defaults to config.SEARCH_FOLDS)
+        """
+        self.alphas = np.asarray(alphas if alphas is not None else config.SEARCH_ALPHAS, dtype=float)
+        self.n_folds = n_folds or config.SEARCH_FOLDS
+        self.feature_columns = None
+        self.results = None
+        self.best = None
+        
+        # Cached fold statistics
+        self._fold_grams = None
+        self._total_gram = None
+        self._scale = None
+        self._mean = None
+        self._y_mean = None
+    
+    def _build_folds(self, X, y):
+        """Compute the per-fold augmented Gram matrices in one pass"""
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n, k = X.shape
+        
+        # Centering globally first keeps the Gram matrices well conditioned
+        self._mean = X.mean(axis=0)
+        self._y_mean = y.mean()
+        
+        bounds = np.linspace(0, n, self.n_folds + 1).astype(int)
+        self._fold_grams = np.empty((self.n_folds, k + 2, k + 2))
+        
+        for fold in range(self.n_folds):
+            lo, hi = bounds[fold], bounds[fold + 1]
+            Z = np.column_stack([X[lo:hi] - self._mean, y[lo:hi] - self._y_mean, np.ones(hi - lo)])
+            self._fold_grams[fold] = Z.T @ Z
+        
+        self._total_gram = self._fold_grams.sum(axis=0)
+        
+        # Penalties apply to standardized coefficients
+        scale = np.sqrt(np.diag(self._total_gram)[:k] / n)
+        self._scale = np.where(scale > 0, scale, 1.0)
+    
+    @staticmethod
+    def _moments(gram, subset):
+        """Split an augmented Gram matrix into the statistics of a feature subset"""
+        y_col, one_col = -2, -1
+        return {
+            'n': gram[one_col, one_col],
+            'sx': gram[subset, one_col],
+            'sy': gram[y_col, one_col],
+            'xx': gram[np.ix_(subset, subset)],
+            'xy': gram[subset, y_col],
+            'yy': gram[y_col, y_col]
+        }
+    
+    def _solve_path(self, train, scale):
+        """
+        Ridge coefficients for every penalty from one eigendecomposition
+        
+        Returns:
+            Tuple of (weights (k, n_alphas), intercepts (n_alphas,)) on the
+            globally centered scale
+        """
+        mean_x = train['sx'] / train['n']
+        mean_y = train['sy'] / train['n']
+        
+        # Centered, standardized normal equations of the training fold
+        cov = (train['xx'] - train['n'] * np.outer(mean_x, mean_x)) / np.outer(scale, scale)
+        cross = (train['xy'] - train['n'] * mean_x * mean_y) / scale
+        
+        eigvals, eigvecs = np.linalg.eigh(cov)
+        eigvals = np.maximum(eigvals, 0)
+        projected = eigvecs.T @ cross
+        
+        # Zero penalty on a singular design falls back to the minimum-norm solution
+        denom = eigvals[:, None] + self.alphas[None, :]
+        tiny = 1e-9 * max(eigvals.max(), 1.0)
+        ratios = np.divide(projected[:, None], denom, out=np.zeros_like(denom), where=denom > tiny)
+        
+        weights = (eigvecs @ ratios) / scale[:, None]
+        intercepts = mean_y - mean_x @ weights
+        return weights, intercepts
+    
+    @staticmethod
+    def _sse(valid, weights, intercepts):
+        """Validation sum of squared errors for every penalty, from fold statistics"""
+        return (valid['yy']
+                - 2 * weights.T @ valid['xy']
+                - 2 * intercepts * valid['sy']
+                + np.einsum('ia,ij,ja->a', weights, valid['xx'], weights)
+                + 2 * intercepts * (weights.T @ valid['sx'])
+                + valid['n'] * intercepts ** 2)
+    
+    def default_subsets(self, feature_columns):
+        """
+        Candidate feature subsets: all features, each single feature left out,
+        the calendar features only and the cyclical encodings only
+        """
+        subsets = [list(feature_columns)]
+        subsets += [[c for c in feature_columns if c != dropped] for dropped in feature_columns]
+        
+        calendar = [c for c in feature_columns if c in config.FEATURE_COLUMNS]
+        cyclical = [c for c in calendar if c.endswith(('_sin', '_cos'))]
+        for subset in (calendar, cyclical):
+            if subset and subset not in subsets:
+                subsets.append(subset)
+        
+        return [s for s in subsets if s]
+    
+    def fit(self, X, y, subsets=None):
+        """
+        Run the search
+        
+        Args:
+            X: Feature DataFrame (from DataManager.get_training_data)
+            y: Target values
+            subsets: List of feature name lists (defaults to default_subsets)
+        
+        Returns:
+            DataFrame of results sorted by validation RMSE
+        """
+        t0 = time.perf_counter()
+        self.feature_columns = list(X.columns)
+        self._build_folds(X, y)
+        
+        if subsets is None:
+            subsets = self.default_subsets(self.feature_columns)
+        
+        n_total = self._total_gram[-1, -1]
+        rows = []
+        
+        for features in subsets:
+            subset = np.array([self.feature_columns.index(c) for c in features])
+            scale = self._scale[subset]
+            sse = np.zeros(len(self.alphas))
+            
+            for fold in range(self.n_folds):
+                valid = self._moments(self._fold_grams[fold], subset)
+                train = self._moments(self._total_gram - self._fold_grams[fold], subset)
+                weights, intercepts = self._solve_path(train, scale)
+                sse += self._sse(valid, weights, intercepts)
+            
+            rmse = np.sqrt(np.maximum(sse, 0) / n_total)
+            for alpha, score in zip(self.alphas, rmse):
+                rows.append({'alpha': float(alpha), 'features': features, 'rmse': float(score)})
+        
+        self.results = pd.DataFrame(rows).sort_values('rmse', kind='stable').reset_index(drop=True)
+        self.best = self.results.iloc[0].to_dict()
+        
+        seconds = time.perf_counter() - t0
+        print(f"✓ Evaluated {len(rows)} configurations ({len(subsets)} feature subsets x "
+              f"{len(self.alphas)} penalties, {self.n_folds} folds) in {seconds:.2f}s")
+        print(f"  Best: alpha={self.best['alpha']:g}, {len(self.best['features'])} features, "
+              f"RMSE {self.best['rmse']:.2f} MW")
+        
+        return self.results
+    
+    def save(self, filepath=None):
+        """Persist the best configuration (and the ranked results) as JSON"""
+        if self.best is None:
+            print("✗ Run the search before saving it")
+            return False
+        
+        if filepath is None:
+            filepath = config.SEARCH_RESULT_FILE
+        
+        try:
+            with open(filepath, 'w') as f:
+                json.dump({
+                    'best': self.best,
+                    'feature_columns': self.feature_columns,
+                    'folds': self.n_folds,
+                    'results': self.results.to_dict(orient='records')
+                }, f, indent=2)
+            print(f"✓ Search result saved to {filepath}")
+            return True
+        
+        except Exception as e:
+            print(f"✗ Error saving search result: {str(e)}")
+            return False
+
+
+def load_best_config(filepath=None):
+    """
+    Load the best configuration saved by RidgeSearch.save
+    
+    Returns:
+        Dictionary with alpha, features and rmse, or None if nothing is saved
+    """
+    if filepath is None:
+        filepath = config.SEARCH_RESULT_FILE
+    
+    if not os.path.exists(filepath):
+        return None
+    
+    try:
+        with open(filepath) as f:
+            return json.load(f)['best']
+    except Exception as e:
+        print(f"✗ Error loading search result: {str(e)}")
+        return None
@@ -3,35 +3,252 @@ Predictor Module
 Handles machine learning model training and predictions
 """
 
+import os
 import pickle
+import tempfile
+import threading
+from statistics import NormalDist
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import config
+from data_manager import calendar_features
+from exogenous import ExogenousData
+import profiler
+from profiler import profiled
+from shared_store import SharedArrayStore
+
+
+class SegmentedLinearModel:
+    """
+    Linear model with a separate fit for every (day_of_week, hour) segment
+    
+    The coefficients of all 168 segments are stacked in one (168 x k) array,
+    so a batch is predicted with a single gather and a row-wise dot product.
+    """
+    
+    N_SEGMENTS = 7 * 24
+    
+    def __init__(self, min_samples=None):
+        """
+        Initialize the segmented model
+        
+        Args:
+            min_samples: Minimum rows needed to fit a segment on its own;
+                smaller segments use the global fit instead
+        """
+        if min_samples is None:
+            min_samples = config.MIN_SEGMENT_SAMPLES
+        
+        self.min_samples = min_samples
+        self.coef_ = None
+        self.intercept_ = None
+    
+    @staticmethod
+    def segment_index(X):
+        """Map each feature row to its segment number (day_of_week * 24 + hour)"""
+        hour = X[:, config.FEATURE_COLUMNS.index('hour')]
+        day_of_week = X[:, config.FEATURE_COLUMNS.index('day_of_week')]
+        return (day_of_week * 24 + hour).astype(np.intp)
+    
+    def fit(self, X, y):
+        """
+        Fit one least-squares model per segment
+        
+        Args:
+            X: Feature matrix (columns in config.FEATURE_COLUMNS order)
+            y: Target values
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        
+        # Append a column of ones so the intercept is solved with the weights
+        A = np.column_stack([X, np.ones(len(X))])
+        global_weights = np.linalg.lstsq(A, y, rcond=None)[0]
+        weights = np.tile(global_weights, (self.N_SEGMENTS, 1))
+        
+        # Sort rows by segment once, then slice each segment out
+        segments = self.segment_index(X)
+        order = np.argsort(segments, kind='stable')
+        bounds = np.searchsorted(segments[order], np.arange(self.N_SEGMENTS + 1))
+        
+        for segment in range(self.N_SEGMENTS):
+            rows = order[bounds[segment]:bounds[segment + 1]]
+            if len(rows) >= self.min_samples:
+                weights[segment] = np.linalg.lstsq(A[rows], y[rows], rcond=None)[0]
+        
+        self.coef_ = weights[:, :-1]
+        self.intercept_ = weights[:, -1]
+        return self
+    
+    def predict(self, X):
+        """Predict a batch of rows using each row's segment coefficients"""
+        X = np.asarray(X, dtype=float)
+        segments = self.segment_index(X)
+        return np.einsum('ij,ij->i', X, self.coef_[segments]) + self.intercept_[segments]
+
+
+class RidgeModel:
+    """
+    Ridge regression on standardized features, restricted to a feature subset
+    
+    Coefficients are stored for every input column (zero for unused ones),
+    so the model predicts from the full feature matrix like LinearRegression.
+    """
+    
+    def __init__(self, alpha=None, features=None, feature_columns=None):
+        """
+        Initialize the ridge model
+        
+        Args:
+            alpha: Penalty on the standardized coefficients (defaults to config.RIDGE_ALPHA)
+            features: Names of the columns to use (None for all)
+            feature_columns: Names of all input columns, in order
+        """
+        self.alpha = config.RIDGE_ALPHA if alpha is None else alpha
+        self.features = features
+        self.feature_columns = feature_columns or list(config.FEATURE_COLUMNS)
+        self.coef_ = None
+        self.intercept_ = None
+    
+    def fit(self, X, y):
+        """Solve the penalized normal equations on the selected columns"""
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        
+        if self.features is None:
+            subset = np.arange(X.shape[1])
+        else:
+            subset = np.array([self.feature_columns.index(c) for c in self.features])
+        
+        Xs = X[:, subset]
+        mean_x = Xs.mean(axis=0)
+        mean_y = y.mean()
+        scale = Xs.std(axis=0)
+        scale[scale == 0] = 1.0
+        
+        Z = (Xs - mean_x) / scale
+        weights = np.linalg.lstsq(Z.T @ Z + self.alpha * np.eye(len(subset)),
+                                  Z.T @ (y - mean_y), rcond=None)[0] / scale
+        
+        self.coef_ = np.zeros(X.shape[1])
+        self.coef_[subset] = weights
+        self.intercept_ = float(mean_y - mean_x @ weights)
+        return self
+    
+    def predict(self, X):
+        """Predict a batch of rows"""
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
 
 
 class EnergyPredictor:
     """Machine Learning predictor for energy consumption"""
     
-    def __init__(self):
-        """Initialize the predictor"""
+    def __init__(self, model_type=None):
+        """
+        Initialize the predictor
+        
+        Args:
+            model_type: 'linear', 'segmented' or 'ridge' (defaults to config.MODEL_TYPE)
+        """
         self.model = None
+        self.model_type = model_type or config.MODEL_TYPE
         self.is_trained = False
         self.metrics = {}
+        self.interval_stats = None
+        self.model_mtime = None
+        
+        # Columns the model was trained on; anything after config.FEATURE_COLUMNS
+        # is looked up in the exogenous data
+        self.feature_columns = list(config.FEATURE_COLUMNS)
+        self.exogenous = None
+        
+        # Guards swapping the model; predictions only hold it to take a snapshot
+        self._lock = threading.Lock()
+    
+    def _create_model(self, feature_columns=None):
+        """Create an untrained model for the configured model type"""
+        if self.model_type == 'segmented':
+            return SegmentedLinearModel()
+        if self.model_type == 'ridge':
+            # Use the configuration picked by model_search if there is one
+            from model_search import load_best_config
+            
+            feature_columns = feature_columns or list(config.FEATURE_COLUMNS)
+            best = load_best_config()
+            if best is not None and set(best['features']) <= set(feature_columns):
+                return RidgeModel(best['alpha'], best['features'], feature_columns)
+            return RidgeModel(feature_columns=feature_columns)
+        if self.model_type == 'linear':
+            return LinearRegression()
+        raise ValueError(f"Unknown model type: {self.model_type}")
+    
+    def build_features(self, times, feature_columns=None, exogenous=None):
+        """
+        Build the feature matrix for a batch of timestamps
+        
+        Calendar features are computed directly; exogenous columns
+        (temperature, holidays) are joined from the model's exogenous data.
+        
+        Args:
+            times: DatetimeIndex (or anything pd.DatetimeIndex accepts)
+            feature_columns: Columns to build, from the same snapshot as the
+                model that will use them (defaults to the installed model's)
+            exogenous: ExogenousData from that snapshot
+            
+        Returns:
+            numpy array with one row per timestamp, columns in
+            feature_columns order
+        """
+        if feature_columns is None:
+            state = self._snapshot()
+            feature_columns, exogenous = state['feature_columns'], state['exogenous']
+        
+        times = pd.DatetimeIndex(times)
+        features = calendar_features(times)
+        
+        extra = [f for f in feature_columns if f not in features]
+        if extra:
+            if exogenous is None:
+                raise ValueError(f"Model needs exogenous data for: {', '.join(extra)}")
+            features.update(exogenous.align(times))
+        
+        return np.column_stack([features[f] for f in feature_columns]).astype(float)
         
-    def train_model(self, X, y):
+    @profiled
+    def train_model(self, X, y, exogenous=None, refit=False):
         """
         Train the Linear Regression model
         
         Args:
-            X: Feature matrix
+            X: Feature matrix (a DataFrame's column names are kept as the
+                feature columns)
             y: Target values (energy consumption)
+            exogenous: ExogenousData used to build forecast features when X
+                has exogenous columns
+            refit: If True, refit on all rows after scoring on the test split,
+                so the installed model has seen every row
         """
         try:
             print("\n" + "="*50)
             print("TRAINING ENERGY PREDICTION MODEL")
             print("="*50)
+            print(f"Model type: {self.model_type}")
+            
+            feature_columns = list(getattr(X, 'columns', config.FEATURE_COLUMNS))
+            if feature_columns[:len(config.FEATURE_COLUMNS)] != config.FEATURE_COLUMNS:
+                raise ValueError("Feature matrix must start with config.FEATURE_COLUMNS")
+            
+            # Forecasts rebuild exogenous columns from this data, so it must cover them
+            extra = feature_columns[len(config.FEATURE_COLUMNS):]
+            missing = [c for c in extra if exogenous is None or c not in exogenous.columns]
+            if missing:
+                raise ValueError(f"Model needs exogenous data for: {', '.join(missing)}")
+            
+            # Work on plain arrays so fitting and prediction see the same input
+            X = np.asarray(X, dtype=float)
+            y = np.asarray(y, dtype=float)
             
             ### Split data into training and testing sets
             X_train, X_test, y_train, y_test = train_test_split(
@@ -44,25 +261,37 @@ class EnergyPredictor:
             print(f"Testing samples: {len(X_test)}")
             
             ###Create and train the model
-            self.model = LinearRegression()
-            self.model.fit(X_train, y_train)
+            model = self._create_model(feature_columns)
+            model.fit(X_train, y_train)
             
             # Make predictions on test set
-            y_pred = self.model.predict(X_test)
+            y_pred = model.predict(X_test)
             
             # Calculate metrics
-            self.metrics = {
+            metrics = {
                 'mae': mean_absolute_error(y_test, y_pred),
                 'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
                 'r2': r2_score(y_test, y_pred)
             }
             
-            self.is_trained = True
+            # Residual statistics used for prediction intervals
+            interval_stats = self._fit_interval_stats(model, X_train, y_train, X_test, y_test)
+            
+            # Metrics and intervals keep the test-split estimates
+            if refit:
+                model = self._create_model(feature_columns)
+                model.fit(X, y)
+                print(f"Refitted on all {len(X)} samples")
+            
+            # Install everything at once so concurrent predictions never see
+            # a half-trained model
+            self._install(model, self.model_type, metrics, interval_stats,
+                          feature_columns=feature_columns, exogenous=exogenous)
             
             print("\n✓ Model trained successfully!")
-            print(f"  Mean Absolute Error: {self.metrics['mae']:.2f} MW")
-            print(f"  Root Mean Squared Error: {self.metrics['rmse']:.2f} MW")
-            print(f"  R² Score: {self.metrics['r2']:.4f}")
+            print(f"  Mean Absolute Error: {metrics['mae']:.2f} MW")
+            print(f"  Root Mean Squared Error: {metrics['rmse']:.2f} MW")
+            print(f"  R² Score: {metrics['r2']:.4f}")
             print("="*50 + "\n")
             
             return True
@@ -71,6 +300,113 @@ class EnergyPredictor:
             print(f"✗ Error training model: {str(e)}")
             return False
     
+    def _snapshot(self):
+        """
+        Return everything _install sets, read together under the lock
+        
+        Returns:
+            Dictionary with model, model_type, metrics, interval_stats,
+            model_mtime, feature_columns and exogenous of one installed model
+        """
+        with self._lock:
+            return {
+                'model': self.model,
+                'model_type': self.model_type,
+                'metrics': self.metrics,
+                'interval_stats': self.interval_stats,
+                'model_mtime': self.model_mtime,
+                'feature_columns': self.feature_columns,
+                'exogenous': self.exogenous
+            }
+    
+    def _install(self, model, model_type, metrics, interval_stats, model_mtime=None,
+                 feature_columns=None, exogenous=None):
+        """Atomically replace the in-memory model"""
+        with self._lock:
+            self.feature_columns = list(feature_columns or config.FEATURE_COLUMNS)
+            self.exogenous = exogenous
+            self.model = model
+            self.model_type = model_type
+            self.metrics = metrics
+            self.interval_stats = interval_stats
+            self.model_mtime = model_mtime
+            self.is_trained = True
+    
+    def swap_model(self, other):
+        """
+        Hot-swap in the model held by another trained predictor
+        
+        Predictions already running keep using the model they started with.
+        
+        Args:
+            other: Trained EnergyPredictor to take the model from
+        """
+        state = other._snapshot()
+        self._install(state['model'], state['model_type'], state['metrics'],
+                      state['interval_stats'], state['model_mtime'],
+                      state['feature_columns'], state['exogenous'])
+    
+    def _fit_interval_stats(self, model, X_train, y_train, X_test, y_test):
+        """
+        Precompute everything needed for prediction intervals
+        
+        Analytic intervals use the residual variance and (XᵀX)⁻¹ of the
+        training design (per segment for the segmented model). Conformal
+        intervals use per hour-of-day quantiles of the absolute residuals
+        on the held-out test set.
+        
+        Returns:
+            Dictionary of interval statistics
+        """
+        level = config.PREDICTION_INTERVAL_LEVEL
+        A = np.column_stack([X_train, np.ones(len(X_train))])
+        residuals = y_train - model.predict(X_train)
+        n_params = A.shape[1]
+        
+        # The linear model is treated as a single segment
+        if isinstance(model, SegmentedLinearModel):
+            segments = SegmentedLinearModel.segment_index(X_train)
+            n_segments = SegmentedLinearModel.N_SEGMENTS
+        else:
+            segments = np.zeros(len(A), dtype=np.intp)
+            n_segments = 1
+        
+        global_inv = np.linalg.pinv(A.T @ A)
+        global_sigma2 = residuals @ residuals / max(len(A) - n_params, 1)
+        xtx_inv = np.tile(global_inv, (n_segments, 1, 1))
+        sigma2 = np.full(n_segments, global_sigma2)
+        
+        if n_segments > 1:
+            order = np.argsort(segments, kind='stable')
+            bounds = np.searchsorted(segments[order], np.arange(n_segments + 1))
+            min_rows = max(config.MIN_SEGMENT_SAMPLES, n_params + 1)
+            
+            for segment in range(n_segments):
+                rows = order[bounds[segment]:bounds[segment + 1]]
+                if len(rows) >= min_rows:
+                    A_seg = A[rows]
+                    xtx_inv[segment] = np.linalg.pinv(A_seg.T @ A_seg)
+                    sigma2[segment] = residuals[rows] @ residuals[rows] / (len(rows) - n_params)
+        
+        # Conformal: finite-sample corrected quantile of |residual| per hour
+        hours = X_test[:, config.FEATURE_COLUMNS.index('hour')].astype(np.intp)
+        abs_residuals = np.abs(y_test - model.predict(X_test))
+        conformal = np.zeros(24)
+        
+        for hour in range(24):
+            hour_residuals = abs_residuals[hours == hour]
+            if len(hour_residuals) == 0:
+                hour_residuals = abs_residuals
+            q = min(np.ceil((len(hour_residuals) + 1) * level) / len(hour_residuals), 1.0)
+            conformal[hour] = np.quantile(hour_residuals, q, method='higher')
+        
+        return {
+            'level': level,
+            'sigma2': sigma2,
+            'xtx_inv': xtx_inv,
+            'conformal': conformal
+        }
+    
     def predict(self, features):
         """
         Make a prediction using the trained model
@@ -81,25 +417,105 @@ class EnergyPredictor:
         Returns:
             Predicted energy consumption
         """
-        if not self.is_trained or self.model is None:
+        state = self._snapshot()
+        model = state['model']
+        if not self.is_trained or model is None:
             print("✗ Model not trained yet!")
             return None
         
         try:
             # Convert dictionary to array if needed
             if isinstance(features, dict):
-                feature_order = ['hour', 'day_of_week', 'month', 'day_of_year',
-                               'hour_sin', 'hour_cos', 'month_sin', 'month_cos']
-                features = np.array([[features[f] for f in feature_order]])
+                features = np.array([[features[f] for f in state['feature_columns']]])
             
             # Make prediction
-            prediction = self.model.predict(features)
+            prediction = model.predict(features)
             return prediction[0]
             
         except Exception as e:
             print(f"✗ Error making prediction: {str(e)}")
             return None
     
+    @profiled
+    def predict_batch(self, times):
+        """
+        Predict energy consumption for many timestamps at once
+        
+        Args:
+            times: Sequence of timestamps
+            
+        Returns:
+            numpy array of predictions (one per timestamp)
+        """
+        state = self._snapshot()
+        model = state['model']
+        if not self.is_trained or model is None:
+            print("✗ Model not trained yet!")
+            return None
+        
+        try:
+            return model.predict(self.build_features(times, state['feature_columns'],
+                                                     state['exogenous']))
+            
+        except Exception as e:
+            print(f"✗ Error making prediction: {str(e)}")
+            return None
+    
+    @profiled
+    def predict_interval(self, times, method=None):
+        """
+        Predict energy consumption with prediction intervals
+        
+        Args:
+            times: Sequence of timestamps
+            method: 'analytic' or 'conformal' (defaults to
+                config.PREDICTION_INTERVAL_METHOD)
+            
+        Returns:
+            Tuple of (predictions, lower, upper) numpy arrays; lower and upper
+            are None when the model has no interval statistics
+        """
+        state = self._snapshot()
+        model, stats = state['model'], state['interval_stats']
+        if not self.is_trained or model is None:
+            print("✗ Model not trained yet!")
+            return None, None, None
+        
+        try:
+            X = self.build_features(times, state['feature_columns'], state['exogenous'])
+            predictions = model.predict(X)
+            
+            if stats is None:
+                return predictions, None, None
+            
+            method = method or config.PREDICTION_INTERVAL_METHOD
+            
+            if method == 'conformal':
+                half_width = stats['conformal'][X[:, config.FEATURE_COLUMNS.index('hour')].astype(np.intp)]
+            elif method == 'analytic':
+                A = np.column_stack([X, np.ones(len(X))])
+                z = NormalDist().inv_cdf(0.5 + stats['level'] / 2)
+                
+                # Leverage xᵀ(XᵀX)⁻¹x for every row in one pass
+                if len(stats['sigma2']) == 1:
+                    sigma2 = stats['sigma2'][0]
+                    leverage = np.einsum('ij,jk,ik->i', A, stats['xtx_inv'][0], A)
+                else:
+                    segments = SegmentedLinearModel.segment_index(X)
+                    sigma2 = stats['sigma2'][segments]
+                    leverage = np.einsum('ij,ijk,ik->i', A, stats['xtx_inv'][segments], A)
+                
+                half_width = z * np.sqrt(sigma2 * (1 + leverage))
+            else:
+                raise ValueError(f"Unknown interval method: {method}")
+            
+            return predictions, predictions - half_width, predictions + half_width
+            
+        except Exception as e:
+            print(f"✗ Error making prediction: {str(e)}")
+            return None, None, None
+    
+    @profiled
     def predict_next_day(self, current_datetime):
         """
         Predict energy consumption for the next 24 hours
@@ -113,32 +529,25 @@ class EnergyPredictor:
         if not self.is_trained:
             return None
         
+        times = pd.Timestamp(current_datetime) + pd.to_timedelta(np.arange(24), unit='h')
+        values, lower, upper = self.predict_interval(times)
+        if values is None:
+            return None
+        
         predictions = []
         
-        for hour in range(24):
-            # Calculate features for this hour
-            future_time = current_datetime + pd.Timedelta(hours=hour)
-            
-            features = {
-                'hour': future_time.hour,
-                'day_of_week': future_time.dayofweek,
-                'month': future_time.month,
-                'day_of_year': future_time.dayofyear,
-                'hour_sin': np.sin(2 * np.pi * future_time.hour / 24),
-                'hour_cos': np.cos(2 * np.pi * future_time.hour / 24),
-                'month_sin': np.sin(2 * np.pi * future_time.month / 12),
-                'month_cos': np.cos(2 * np.pi * future_time.month / 12)
-            }
-            
-            pred = self.predict(features)
+        for i, future_time in enumerate(times):
             predictions.append({
                 'datetime': future_time,
                 'hour': future_time.hour,
-                'prediction': pred
+                'prediction': values[i],
+                'lower': lower[i] if lower is not None else None,
+                'upper': upper[i] if upper is not None else None
             })
         
         return predictions
     
+    @profiled
     def predict_next_week(self, current_datetime):
         """
         Predict daily average energy consumption for the next 7 days
@@ -152,42 +561,41 @@ class EnergyPredictor:
         if not self.is_trained:
             return None
         
+        # Hours 24..191 cover days 1-7 after the starting datetime
+        current_datetime = pd.Timestamp(current_datetime)
+        times = current_datetime + pd.to_timedelta(np.arange(24, 8 * 24), unit='h')
+        values, lower, upper = self.predict_interval(times)
+        if values is None:
+            return None
+        
+        # Calculate daily averages; averaging the hourly bounds gives a
+        # conservative band since hourly errors are not perfectly correlated
+        daily_avgs = values.reshape(7, 24).mean(axis=1)
+        if lower is not None:
+            daily_lower = lower.reshape(7, 24).mean(axis=1)
+            daily_upper = upper.reshape(7, 24).mean(axis=1)
+        
         daily_predictions = []
         
-        for day in range(1, 8):
-            # Predict for each hour of the day
-            day_predictions = []
-            
-            for hour in range(24):
-                future_time = current_datetime + pd.Timedelta(days=day, hours=hour)
-                
-                features = {
-                    'hour': future_time.hour,
-                    'day_of_week': future_time.dayofweek,
-                    'month': future_time.month,
-                    'day_of_year': future_time.dayofyear,
-                    'hour_sin': np.sin(2 * np.pi * future_time.hour / 24),
-                    'hour_cos': np.cos(2 * np.pi * future_time.hour / 24),
-                    'month_sin': np.sin(2 * np.pi * future_time.month / 12),
-                    'month_cos': np.cos(2 * np.pi * future_time.month / 12)
-                }
-                
-                pred = self.predict(features)
-                day_predictions.append(pred)
-            
-            # Calculate daily average
-            daily_avg = np.mean(day_predictions)
-            
+        for day, daily_avg in enumerate(daily_avgs, start=1):
             daily_predictions.append({
                 'date': (current_datetime + pd.Timedelta(days=day)).date(),
                 'day_number': day,
-                'prediction': daily_avg
+                'prediction': daily_avg,
+                'lower': daily_lower[day - 1] if lower is not None else None,
+                'upper': daily_upper[day - 1] if upper is not None else None
             })
         
         return daily_predictions
     
     def save_model(self, filepath=None):
-        """Save the trained model to a file"""
+        """
+        Save the trained model to a file
+        
+        The model is written to a temporary file in the same directory and
+        then renamed over the target, so a crash mid-write never leaves a
+        corrupted model file behind.
+        """
         if not self.is_trained:
             print("✗ No trained model to save!")
             return False
@@ -195,16 +603,32 @@ class EnergyPredictor:
         if filepath is None:
             filepath = config.MODEL_FILE
         
+        state = self._snapshot()
+        tmp_path = None
+        
         try:
-            with open(filepath, 'wb') as f:
+            directory = os.path.dirname(os.path.abspath(filepath))
+            with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
                 pickle.dump({
-                    'model': self.model,
-                    'metrics': self.metrics
+                    'model': state['model'],
+                    'model_type': state['model_type'],
+                    'metrics': state['metrics'],
+                    'interval_stats': state['interval_stats'],
+                    'feature_columns': state['feature_columns'],
+                    'exogenous': state['exogenous']
                 }, f)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            os.replace(tmp_path, filepath)
             print(f"✓ Model saved to {filepath}")
             return True
             
         except Exception as e:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             print(f"✗ Error saving model: {str(e)}")
             return False
     
@@ -214,11 +638,17 @@ class EnergyPredictor:
             filepath = config.MODEL_FILE
         
         try:
+            mtime = os.path.getmtime(filepath)
             with open(filepath, 'rb') as f:
                 data = pickle.load(f)
-                self.model = data['model']
-                self.metrics = data['metrics']
-                self.is_trained = True
+            
+            self._install(data['model'],
+                          data.get('model_type', 'linear'),
+                          data['metrics'],
+                          data.get('interval_stats'),
+                          mtime,
+                          data.get('feature_columns'),
+                          data.get('exogenous'))
             
             print(f"✓ Model loaded from {filepath}")
             return True
@@ -230,15 +660,190 @@ class EnergyPredictor:
             print(f"✗ Error loading model: {str(e)}")
             return False
     
+    def evaluate(self, X, y):
+        """
+        Score the current model on a labelled dataset
+        
+        Args:
+            X: Feature matrix (DataFrame columns are matched by name)
+            y: Target values
+            
+        Returns:
+            Dictionary with mae, rmse and r2, or None if not trained
+        """
+        state = self._snapshot()
+        model = state['model']
+        if not self.is_trained or model is None:
+            return None
+        
+        # Score on the columns this model was trained on
+        if hasattr(X, 'columns'):
+            X = X[state['feature_columns']]
+        
+        y = np.asarray(y, dtype=float)
+        y_pred = model.predict(np.asarray(X, dtype=float))
+        
+        return {
+            'mae': mean_absolute_error(y, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y, y_pred)),
+            'r2': r2_score(y, y_pred)
+        }
+    
+    def publish_shared(self, store=None):
+        """
+        Publish the model coefficients to shared memory for worker processes
+        
+        Args:
+            store: SharedArrayStore to publish to (created if not given)
+            
+        Returns:
+            The SharedArrayStore, or None on error
+        """
+        state = self._snapshot()
+        model, stats = state['model'], state['interval_stats']
+        if not self.is_trained or model is None:
+            print("✗ No trained model to publish!")
+            return None
+        
+        if store is None:
+            store = SharedArrayStore(f"{config.SHARED_STORE_NAME}_model")
+        
+        try:
+            arrays = {
+                'coef': np.asarray(model.coef_, dtype=float),
+                'intercept': np.atleast_1d(np.asarray(model.intercept_, dtype=float))
+            }
+            meta = {
+                'model_type': state['model_type'],
+                'metrics': {name: float(value) for name, value in state['metrics'].items()},
+                'feature_columns': state['feature_columns']
+            }
+            
+            if state['exogenous'] is not None:
+                arrays.update({f'exog_{name}': values
+                               for name, values in state['exogenous'].to_arrays().items()})
+            
+            if stats is not None:
+                arrays['sigma2'] = stats['sigma2']
+                arrays['xtx_inv'] = stats['xtx_inv']
+                arrays['conformal'] = stats['conformal']
+                meta['interval_level'] = stats['level']
+            
+            store.publish(arrays, meta)
+            return store
+            
+        except Exception as e:
+            print(f"✗ Error publishing model: {str(e)}")
+            return None
+    
+    def attach_shared(self, store=None):
+        """
+        Use model coefficients published by a loader process
+        
+        The coefficients stay read-only views into shared memory. After
+        store.refresh() returns True, call this again to pick up the new model.
+        
+        Args:
+            store: Attached SharedArrayStore (attached here if not given)
+            
+        Returns:
+            The SharedArrayStore, or None if nothing is published
+        """
+        if store is None:
+            store = SharedArrayStore(f"{config.SHARED_STORE_NAME}_model")
+            if not store.attach():
+                return None
+        
+        arrays = store.arrays
+        meta = store.meta
+        
+        if meta['model_type'] == 'segmented':
+            model = SegmentedLinearModel()
+            model.coef_ = arrays['coef']
+            model.intercept_ = arrays['intercept']
+        elif meta['model_type'] == 'ridge':
+            model = RidgeModel(feature_columns=meta.get('feature_columns'))
+            model.coef_ = arrays['coef']
+            model.intercept_ = float(arrays['intercept'][0])
+        else:
+            model = LinearRegression()
+            model.coef_ = arrays['coef']
+            model.intercept_ = float(arrays['intercept'][0])
+            model.n_features_in_ = len(arrays['coef'])
+        
+        interval_stats = None
+        if 'sigma2' in arrays:
+            interval_stats = {
+                'level': meta['interval_level'],
+                'sigma2': arrays['sigma2'],
+                'xtx_inv': arrays['xtx_inv'],
+                'conformal': arrays['conformal']
+            }
+        
+        exogenous = None
+        exogenous_arrays = {name[len('exog_'):]: values for name, values in arrays.items()
+                            if name.startswith('exog_')}
+        if exogenous_arrays:
+            exogenous = ExogenousData.from_arrays(exogenous_arrays)
+        
+        self._install(model, meta['model_type'], meta['metrics'], interval_stats,
+                      feature_columns=meta.get('feature_columns'), exogenous=exogenous)
+        print(f"✓ Attached to shared model (version {store.version})")
+        return store
+    
+    def reload_if_changed(self, filepath=None):
+        """
+        Reload the model if the model file changed since it was loaded
+        
+        Lets serving processes pick up a model written by another process
+        without restarting.
+        
+        Returns:
+            True if a new model was loaded
+        """
+        if filepath is None:
+            filepath = config.MODEL_FILE
+        
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            return False
+        
+        if mtime == self.model_mtime:
+            return False
+        
+        return self.load_model(filepath)
+    
+    def start_profiling(self, calls=None, seconds=None, output_dir=None, memory=True):
+        """
+        Capture cProfile and tracemalloc reports for the next instrumented calls
+        
+        Args:
+            calls: Stop after this many calls (defaults to config.PROFILE_DEFAULT_CALLS)
+            seconds: Stop after this many seconds
+            output_dir: Report directory (defaults to config.PROFILE_OUTPUT_DIR)
+            memory: Also capture allocation reports
+            
+        Returns:
+            The running profiler.ProfileSession
+        """
+        return profiler.start(calls, seconds, output_dir, memory)
+    
+    def stop_profiling(self):
+        """End the profiling window early and write its reports (returns their paths)"""
+        return profiler.stop()
+    
     def get_model_info(self):
         """Get information about the trained model"""
         if not self.is_trained:
             return None
         
+        state = self._snapshot()
         return {
             'trained': self.is_trained,
-            'metrics': self.metrics,
-            'coefficients': len(self.model.coef_) if self.model else 0
+            'model_type': state['model_type'],
+            'metrics': state['metrics'],
+            'coefficients': np.size(state['model'].coef_) if state['model'] else 0
         }
 
 
@@ -0,0 +1,313 @@
+"""
+Profiler Module
+On-demand cProfile and tracemalloc capture for a bounded number of calls or seconds
+
+Enable it without code changes by setting the environment variable named by
+config.PROFILE_ENV_VAR, e.g. SEMS_PROFILE="calls=20" or
+SEMS_PROFILE="seconds=60,dir=/tmp/profiles", or from code with
+DataManager.start_profiling() / EnergyPredictor.start_profiling().
+"""
+
+import atexit
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import config
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class ProfileSession:
+    """One capture window: profiles the outermost instrumented calls until it expires"""
+    
+    def __init__(self, calls=None, seconds=None, output_dir=None, memory=True):
+        """
+        Prepare a capture window
+        
+        The window opens at the first instrumented call, so tracing does not
+        cover start-up work such as imports.
+        
+        Args:
+            calls: Stop after this many instrumented calls
+            seconds: Stop this many seconds after the window opens
+            output_dir: Where the reports are written (defaults to config.PROFILE_OUTPUT_DIR)
+            memory: Also trace allocations with tracemalloc
+        """
+        if calls is None and seconds is None:
+            calls = config.PROFILE_DEFAULT_CALLS
+        
+        self.max_calls = calls
+        self.seconds = seconds
+        self.deadline = None
+        self.output_dir = os.path.join(output_dir or config.PROFILE_OUTPUT_DIR,
+                                       f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        self.profile = cProfile.Profile()
+        self.calls = []
+        self.started = None
+        
+        # Only one call is profiled at a time; nested and concurrent calls run plain
+        self._busy = threading.Lock()
+        
+        self.memory = memory
+        self._owns_tracemalloc = False
+        self._baseline = None
+    
+    def _open(self):
+        """Start the clock and allocation tracing at the first profiled call"""
+        self.started = time.perf_counter()
+        if self.seconds is not None:
+            self.deadline = time.monotonic() + self.seconds
+        
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(config.PROFILE_TRACEBACK_DEPTH)
+                self._owns_tracemalloc = True
+            self._baseline = tracemalloc.take_snapshot()
+    
+    def expired(self):
+        """True once the call or time budget is used up"""
+        if self.max_calls is not None and len(self.calls) >= self.max_calls:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def run(self, name, func, args, kwargs):
+        """Call func under the profiler and record its wall time"""
+        if self.expired():
+            stop()
+            return func(*args, **kwargs)
+        
+        if not self._busy.acquire(blocking=False):
+            return func(*args, **kwargs)
+        
+        if self.started is None:
+            self._open()
+        
+        t0 = time.perf_counter()
+        try:
+            self.profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.profile.disable()
+        finally:
+            self.calls.append((name, time.perf_counter() - t0))
+            self._busy.release()
+            if self.expired():
+                stop()
+    
+    def _collapsed_stacks(self, stats):
+        """
+        Convert cProfile caller/callee statistics to collapsed stacks
+        
+        cProfile only records caller -> callee edges, so each path's time is
+        estimated by splitting a function's time among its callees in
+        proportion to the edge times, as flamegraph converters for cProfile do.
+        
+        Returns:
+            List of "root;caller;function microseconds" lines
+        """
+        callees = {}
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+        
+        def label(func):
+            filename, line, name = func
+            return f"{name} ({os.path.basename(filename)}:{line})" if line else name
+        
+        lines = []
+        
+        def walk(func, total, path):
+            _, _, own, cumulative, _ = stats[func]
+            path = path + [label(func)]
+            if cumulative <= 0:
+                return
+            self_time = total * own / cumulative
+            if self_time * 1e6 >= 1:
+                lines.append(f"{';'.join(path)} {int(self_time * 1e6)}")
+            if len(path) >= config.PROFILE_MAX_STACK_DEPTH:
+                return
+            for child, edge_time in callees.get(func, []):
+                child_total = total * edge_time / cumulative
+                if child_total * 1e6 >= 1 and label(child) not in path:
+                    walk(child, child_total, path)
+        
+        roots = [func for func, entry in stats.items()
+                 if not any(caller in stats for caller in entry[4])]
+        for root in roots:
+            walk(root, stats[root][3], [])
+        
+        return lines
+    
+    def write(self):
+        """
+        Write the reports for this session
+        
+        Returns:
+            Dictionary of report name -> file path
+        """
+        # Snapshot allocations first so building the reports does not show up in them
+        if self.memory and self._baseline is not None:
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+            baseline = self._baseline.filter_traces(ignore)
+            current, peak = tracemalloc.get_traced_memory()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = {
+            'pstats': os.path.join(self.output_dir, 'profile.pstats'),
+            'stacks': os.path.join(self.output_dir, 'stacks.collapsed'),
+            'summary': os.path.join(self.output_dir, 'summary.txt')
+        }
+        top_n = config.PROFILE_TOP_N
+        
+        # pstats refuses a profile that never ran
+        buffer = io.StringIO()
+        stacks = []
+        if self.calls:
+            self.profile.dump_stats(paths['pstats'])
+            stats = pstats.Stats(self.profile, stream=buffer)
+            stacks = self._collapsed_stacks(stats.stats)
+            stats.sort_stats('cumulative').print_stats(top_n)
+        else:
+            del paths['pstats']
+        
+        with open(paths['stacks'], 'w') as f:
+            f.write(''.join(f"{line}\n" for line in stacks))
+        
+        with open(paths['summary'], 'w') as f:
+            window = time.perf_counter() - self.started if self.started is not None else 0.0
+            f.write(f"Window: {window:.2f}s, "
+                    f"{len(self.calls)} profiled calls\n\n")
+            for name, seconds in self.calls:
+                f.write(f"{seconds * 1000:10.1f} ms  {name}\n")
+            f.write(f"\nTop {top_n} functions by cumulative time\n")
+            f.write(buffer.getvalue())
+        
+        if self.memory and self._baseline is not None:
+            paths['allocations'] = os.path.join(self.output_dir, 'allocations.txt')
+            with open(paths['allocations'], 'w') as f:
+                f.write(f"Traced memory: {current / 2**20:.1f} MiB current, "
+                        f"{peak / 2**20:.1f} MiB peak\n\n")
+                f.write(f"Top {top_n} allocation sites by growth during the window\n")
+                for diff in snapshot.compare_to(baseline, 'lineno')[:top_n]:
+                    f.write(f"{diff}\n")
+                
+                f.write(f"\nTop {top_n} allocation tracebacks by live size\n")
+                for stat in snapshot.statistics('traceback')[:top_n]:
+                    f.write(f"\n{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                    f.write('\n'.join(f"    {line}" for line in stat.traceback.format()) + '\n')
+        
+        return paths
+
+
+def profiled(func):
+    """
+    Instrument a method for profiling sessions
+    
+    When no session is active the wrapper only checks a module global.
+    """
+    name = func.__qualname__
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _session
+        if session is None:
+            return func(*args, **kwargs)
+        return session.run(name, func, args, kwargs)
+    
+    return wrapper
+
+
+def start(calls=None, seconds=None, output_dir=None, memory=True):
+    """
+    Start a profiling session (replacing any running one)
+    
+    Args:
+        calls: Stop after this many instrumented calls
+        seconds: Stop after this many seconds
+        output_dir: Report directory (defaults to config.PROFILE_OUTPUT_DIR)
+        memory: Also capture tracemalloc allocation reports
+    
+    Returns:
+        The ProfileSession
+    """
+    global _session
+    stop()
+    
+    with _session_lock:
+        _session = ProfileSession(calls, seconds, output_dir, memory)
+    
+    limits = [limit for limit in (f"{calls} calls" if calls else None,
+                                  f"{seconds}s" if seconds else None) if limit]
+    print(f"ℹ Profiling started ({', '.join(limits) or 'default limit'})")
+    return _session
+
+
+def stop():
+    """
+    End the running session and write its reports
+    
+    Returns:
+        Dictionary of report name -> file path, or None if nothing was running
+    """
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    
+    if session is None:
+        return None
+    
+    try:
+        paths = session.write()
+        print(f"✓ Profile written to {session.output_dir} ({len(session.calls)} calls)")
+        return paths
+    except Exception as e:
+        print(f"✗ Error writing profile: {str(e)}")
+        return None
+
+
+def is_active():
+    """True while a profiling session is running"""
+    return _session is not None
+
+
+def start_from_env():
+    """
+    Start a session from the environment variable named by config.PROFILE_ENV_VAR
+    
+    The value is "1" for the defaults or comma-separated options:
+    calls=N, seconds=S, dir=PATH, memory=0.
+    """
+    value = os.environ.get(config.PROFILE_ENV_VAR, '').strip()
+    if not value or value == '0' or is_active():
+        return None
+    
+    options = {}
+    for part in value.split(','):
+        if '=' in part:
+            key, option = part.split('=', 1)
+            options[key.strip()] = option.strip()
+    
+    try:
+        return start(calls=int(options['calls']) if 'calls' in options else None,
+                     seconds=float(options['seconds']) if 'seconds' in options else None,
+                     output_dir=options.get('dir'),
+                     memory=options.get('memory', '1') != '0')
+    except ValueError as e:
+        print(f"✗ Invalid {config.PROFILE_ENV_VAR} value: {str(e)}")
+        return None
+
+
+# Flush a window that is still open when the process exits
+atexit.register(stop)
+start_from_env()
@@ -47,11 +47,12 @@ except ImportError:
     print("      MacOS/Windows: Should be pre-installed with Python")
 
 print("\n📋 Step 3: Run the Application")
-print("   Command: python main.py")
+print("   Dashboard: streamlit run app.py")
+print("   Command line: python main.py --help")
 
 print("\n📋 File Checklist:")
 import os
-files = ['app.py', 'config.py', 'data_manager.py', 'predictor.py', 
+files = ['app.py', 'main.py', 'config.py', 'data_manager.py', 'predictor.py', 
          'chart_generator.py', 'dataset.csv', 'README.md']
 
 for file in files:
@@ -73,5 +74,5 @@ print("   • Device Simulator - Calculate appliance costs")
 print("   • Reports - Daily/weekly analytics with charts")
 
 print("\n" + "="*60)
-print("Ready to start? Run: python main.py")
+print("Ready to start? Run: streamlit run app.py")
 print("="*60 + "\n")
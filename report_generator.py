@@ -0,0 +1,246 @@
+"""
+Report Generator Module
+Exports Daily/Weekly/Monthly report charts in parallel worker processes
+"""
+
+import io
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+import config
+
+
+_chart_generator = None
+
+
+def _init_render_worker():
+    """Switch the worker to the non-interactive Agg backend before charts are drawn"""
+    global _chart_generator
+    import matplotlib
+    matplotlib.use('Agg')
+    from chart_generator import ChartGenerator
+    
+    _chart_generator = ChartGenerator()
+
+
+def _render_report(task):
+    """Render one report in a worker process and return its output path"""
+    import matplotlib.pyplot as plt
+    
+    title = task['title']
+    values = pd.Series(task['values'], index=task['index'])
+    
+    if task['type'] == 'Daily':
+        fig = _chart_generator.create_daily_chart(values, title=title)
+    else:
+        fig = _chart_generator.create_weekly_chart(values, title=title)
+    
+    if task['format'] == 'html':
+        buffer = io.StringIO()
+        fig.savefig(buffer, format='svg')
+        rows = ''.join(f"<tr><th>{name.replace('_', ' ').title()}</th><td>{value:,.2f}</td></tr>"
+                       for name, value in task['stats'].items())
+        with open(task['path'], 'w', encoding='utf-8') as f:
+            f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title></head>"
+                    f"<body><h1>{title}</h1>{buffer.getvalue()}<table>{rows}</table></body></html>\n")
+    else:
+        fig.savefig(task['path'], format=task['format'], dpi=config.REPORT_DPI)
+    
+    plt.close(fig)
+    return task['path']
+
+
+class ReportGenerator:
+    """Builds report statistics from precomputed aggregates and exports charts"""
+    
+    def __init__(self, data_manager):
+        """
+        Initialize the report generator
+        
+        Args:
+            data_manager: DataManager with data loaded on the hourly grid
+        """
+        self.data_manager = data_manager
+        self.dates = None
+        self.day_matrix = None
+    
+    def _aggregates(self):
+        """Get the (n_days, 24) day matrix, computing it once"""
+        if self.day_matrix is None:
+            dates, matrix = self.data_manager.get_day_matrix()
+            if matrix is None:
+                raise ValueError("Report export needs data loaded on the hourly grid")
+            self.dates = pd.DatetimeIndex(dates)
+            self.day_matrix = matrix
+        return self.dates, self.day_matrix
+    
+    def _periods(self, report_type, start=None, end=None):
+        """
+        Split the day matrix within the date range into report periods
+        
+        Periods are runs of consecutive days sharing a Daily/Weekly/Monthly key.
+        
+        Returns:
+            Tuple of (dates, matrix, starts, stops); period i covers day
+            rows starts[i]..stops[i] (no periods if no whole day is in range)
+        """
+        if report_type not in config.REPORT_TYPES:
+            raise ValueError(f"Unknown report type: {report_type}")
+        
+        dates, matrix = self._aggregates()
+        
+        keep = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            keep &= dates >= pd.Timestamp(start)
+        if end is not None:
+            keep &= dates <= pd.Timestamp(end)
+        dates = dates[keep]
+        matrix = matrix[keep]
+        
+        if report_type == 'Daily':
+            keys = np.arange(len(dates))
+        elif report_type == 'Weekly':
+            keys = dates.to_period('W').asi8
+        else:
+            keys = dates.to_period('M').asi8
+        
+        if len(dates) == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return dates, matrix, empty, empty
+        
+        bounds = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1], True])
+        return dates, matrix, bounds[:-1], bounds[1:]
+    
+    @staticmethod
+    def _period_table(dates, matrix, starts, stops):
+        """Per-period statistics with vectorized reductions over the day matrix"""
+        daily_totals = matrix.sum(axis=1)
+        
+        totals = np.add.reduceat(daily_totals, starts) if len(starts) else np.zeros(0)
+        maxima = np.maximum.reduceat(matrix.max(axis=1), starts) if len(starts) else np.zeros(0)
+        minima = np.minimum.reduceat(matrix.min(axis=1), starts) if len(starts) else np.zeros(0)
+        hours = (stops - starts) * 24
+        
+        return pd.DataFrame({
+            'period_start': dates[starts],
+            'period_end': dates[stops - 1],
+            'total_energy': totals,
+            'avg_energy': totals / np.maximum(hours, 1),
+            'max_energy': maxima,
+            'min_energy': minima,
+            'hours': hours,
+            'total_cost': totals * 1000 * config.ENERGY_COST_PER_KWH
+        })
+    
+    def period_stats(self, report_type, start=None, end=None):
+        """
+        Get the statistics of every report period in the range
+        
+        These are the same figures the report charts show: only whole days
+        on the hourly grid are counted.
+        
+        Args:
+            report_type: 'Daily', 'Weekly' or 'Monthly'
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+        
+        Returns:
+            DataFrame with one row per period (period_start, period_end,
+            total_energy, avg_energy, max_energy, min_energy, hours, total_cost)
+        """
+        return self._period_table(*self._periods(report_type, start, end))
+    
+    def build_tasks(self, report_type, start=None, end=None, out_dir=None, fmt=None):
+        """
+        Prepare one render task per period
+        
+        All statistics are computed here with vectorized reductions over the
+        day matrix; workers only draw and save.
+        
+        Args:
+            report_type: 'Daily', 'Weekly' or 'Monthly'
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+            out_dir: Output directory (defaults to config.REPORT_OUTPUT_DIR)
+            fmt: 'png', 'svg' or 'html' (defaults to config.REPORT_CHART_FORMAT)
+        
+        Returns:
+            List of task dictionaries
+        """
+        out_dir = out_dir or config.REPORT_OUTPUT_DIR
+        fmt = fmt or config.REPORT_CHART_FORMAT
+        dates, matrix, starts, stops = self._periods(report_type, start, end)
+        stats = self._period_table(dates, matrix, starts, stops)
+        daily_totals = matrix.sum(axis=1)
+        
+        os.makedirs(out_dir, exist_ok=True)
+        tasks = []
+        
+        for i, (lo, hi) in enumerate(zip(starts, stops)):
+            first = dates[lo].date()
+            if report_type == 'Daily':
+                title = f"Daily Energy Consumption - {first}"
+                index = list(range(24))
+                values = matrix[lo]
+            else:
+                title = f"{report_type} Energy Consumption - {first} to {dates[hi - 1].date()}"
+                index = [d.date() for d in dates[lo:hi]]
+                values = daily_totals[lo:hi]
+            
+            row = stats.iloc[i]
+            tasks.append({
+                'type': report_type,
+                'title': title,
+                'index': index,
+                'values': values,
+                'format': fmt,
+                'path': os.path.join(out_dir, f"{report_type.lower()}_{first}.{fmt}"),
+                'stats': {name: float(row[name]) for name in
+                          ('total_energy', 'avg_energy', 'max_energy', 'min_energy', 'total_cost')}
+            })
+        
+        return tasks
+    
+    def export(self, report_type, start=None, end=None, out_dir=None, fmt=None, workers=None):
+        """
+        Render and save the report charts for every period in the range
+        
+        Args:
+            report_type: 'Daily', 'Weekly' or 'Monthly'
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+            out_dir: Output directory (defaults to config.REPORT_OUTPUT_DIR)
+            fmt: 'png', 'svg' or 'html' (defaults to config.REPORT_CHART_FORMAT)
+            workers: Number of worker processes (defaults to all cores)
+        
+        Returns:
+            Dictionary with the number of reports, elapsed seconds and
+            reports per second
+        """
+        t0 = time.perf_counter()
+        tasks = self.build_tasks(report_type, start, end, out_dir, fmt)
+        
+        if not tasks:
+            print(f"ℹ No whole days in range; no {report_type.lower()} reports exported")
+            return {'reports': 0, 'seconds': time.perf_counter() - t0, 'reports_per_second': 0.0}
+        
+        workers = workers or os.cpu_count()
+        chunksize = max(1, len(tasks) // (workers * 4))
+        
+        with Pool(workers, initializer=_init_render_worker) as pool:
+            for _ in pool.imap_unordered(_render_report, tasks, chunksize=chunksize):
+                pass
+        
+        seconds = time.perf_counter() - t0
+        rate = len(tasks) / seconds if seconds > 0 else 0.0
+        
+        print(f"✓ Exported {len(tasks)} {report_type.lower()} reports in {seconds:.1f}s "
+              f"({rate:.1f} reports/s)")
+        
+        return {
+            'reports': len(tasks),
+            'seconds': seconds,
+            'reports_per_second': rate
+        }
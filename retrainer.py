@@ -0,0 +1,144 @@
+"""
+Retrainer Module
+Retrains the energy model in the background and hot-swaps it into live predictors
+"""
+
+import os
+import threading
+import weakref
+from datetime import datetime
+import config
+from data_manager import DataManager
+from predictor import EnergyPredictor
+
+
+class RetrainingScheduler:
+    """Periodically retrains, validates and publishes the energy model"""
+    
+    def __init__(self, interval=None, filepath=None, model_type=None, retrain=True):
+        """
+        Initialize the scheduler
+        
+        Args:
+            interval: Seconds between runs (defaults to config.RETRAIN_INTERVAL_SECONDS)
+            filepath: Model file to publish to (defaults to config.MODEL_FILE)
+            model_type: Model type for retrained models (defaults to config.MODEL_TYPE)
+            retrain: If False, only watch the model file and reload it when another
+                process publishes a new model
+        """
+        self.interval = interval or config.RETRAIN_INTERVAL_SECONDS
+        self.filepath = filepath or config.MODEL_FILE
+        self.model_type = model_type
+        self.retrain = retrain
+        self.last_result = None
+        
+        # Live predictors to hot-swap; weak so the scheduler never keeps them alive
+        self._predictors = weakref.WeakSet()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def register(self, predictor):
+        """Register a live EnergyPredictor to receive new models"""
+        self._predictors.add(predictor)
+    
+    def start(self):
+        """Start the background worker thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='model-retrainer', daemon=True)
+        self._thread.start()
+        print(f"✓ Retraining scheduler started (every {self.interval}s)")
+    
+    def stop(self, timeout=None):
+        """Stop the background worker thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Worker loop: run once per interval until stopped"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                if self.retrain:
+                    self.run_once()
+                else:
+                    self.reload_predictors()
+            except Exception as e:
+                print(f"✗ Error in retraining scheduler: {str(e)}")
+    
+    def reload_predictors(self):
+        """Reload registered predictors whose model file changed on disk"""
+        reloaded = 0
+        for predictor in list(self._predictors):
+            if predictor.reload_if_changed(self.filepath):
+                reloaded += 1
+        return reloaded
+    
+    def run_once(self):
+        """
+        Train a model on fresh data and publish it if it validates
+        
+        The most recent config.RETRAIN_VALIDATION_HOURS rows are held out. The
+        candidate and the currently published model's configuration (its model
+        type and feature columns) are both trained on the rows before them and
+        scored on them, so neither has seen the validation window. The
+        candidate is published only if its RMSE is no worse than the current
+        configuration's (within config.RETRAIN_TOLERANCE); it is then refitted
+        on all rows so the newest hours reach the served model.
+        
+        Returns:
+            Dictionary describing the run, or None if training failed
+        """
+        data_manager = DataManager()
+        if not data_manager.load_data() or not data_manager.prepare_features():
+            return None
+        
+        X, y = data_manager.get_training_data()
+        n_val = min(config.RETRAIN_VALIDATION_HOURS, len(X) // 5)
+        X_fit, y_fit = X.iloc[:-n_val], y.iloc[:-n_val]
+        X_val, y_val = X.iloc[-n_val:], y.iloc[-n_val:]
+        
+        candidate = EnergyPredictor(self.model_type)
+        if not candidate.train_model(X_fit, y_fit, data_manager.exogenous):
+            return None
+        candidate_rmse = candidate.evaluate(X_val, y_val)['rmse']
+        
+        # Retrain the current configuration on the same rows for a fair comparison
+        current_rmse = None
+        current = EnergyPredictor()
+        if current.load_model(self.filepath):
+            columns = current.feature_columns
+            if set(columns) <= set(X.columns):
+                baseline = EnergyPredictor(current.model_type)
+                if baseline.train_model(X_fit[columns], y_fit, data_manager.exogenous):
+                    current_rmse = baseline.evaluate(X_val, y_val)['rmse']
+            else:
+                print("ℹ Current model's features are no longer available; "
+                      "skipping the comparison")
+        
+        accepted = bool(current_rmse is None or
+                        candidate_rmse <= current_rmse * (1 + config.RETRAIN_TOLERANCE))
+        
+        if not accepted:
+            print(f"ℹ Kept current model (validation RMSE {current_rmse:.2f} MW "
+                  f"vs candidate {candidate_rmse:.2f} MW)")
+        elif (candidate.train_model(X, y, data_manager.exogenous, refit=True)
+              and candidate.save_model(self.filepath)):
+            candidate.model_mtime = os.path.getmtime(self.filepath)
+            for predictor in list(self._predictors):
+                predictor.swap_model(candidate)
+            print(f"✓ New model published (validation RMSE {candidate_rmse:.2f} MW)")
+        else:
+            accepted = False
+        
+        self.last_result = {
+            'time': datetime.now(),
+            'accepted': accepted,
+            'candidate_rmse': candidate_rmse,
+            'current_rmse': current_rmse,
+            'validation_rows': n_val
+        }
+        return self.last_result
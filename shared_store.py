@@ -0,0 +1,234 @@
+"""
+Shared Store Module
+Shares the dataset and model arrays between worker processes without copying
+"""
+
+import json
+import struct
+import sys
+import time
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import config
+
+
+# Manifest layout: sequence counter (odd while being written), JSON length, JSON
+_HEADER = struct.Struct('<qq')
+_MANIFEST_SIZE = 64 * 1024
+_ALIGNMENT = 64
+
+
+def _open_block(name):
+    """Attach to an existing shared memory block without taking ownership of it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    
+    # Before 3.13 attaching registers the block with the resource tracker,
+    # which would unlink it when the worker exits, so skip the registration
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedArrayStore:
+    """Publishes named NumPy arrays in shared memory under a version stamp"""
+    
+    def __init__(self, name=None):
+        """
+        Initialize the store
+        
+        Args:
+            name: Shared memory name prefix (defaults to config.SHARED_STORE_NAME)
+        """
+        self.name = name or config.SHARED_STORE_NAME
+        self.version = None
+        self.meta = {}
+        self.arrays = {}
+        
+        self._manifest = None
+        self._block = None
+        self._owner = False
+        self._retired = []
+    
+    def publish(self, arrays, meta=None):
+        """
+        Copy arrays into a new shared memory block and announce it
+        
+        Workers keep reading the previous block until they call refresh().
+        
+        Args:
+            arrays: Dictionary of name -> NumPy array
+            meta: Optional JSON-serializable metadata published with the arrays
+        
+        Returns:
+            The new version number
+        """
+        if self._manifest is None:
+            self._create_manifest()
+        
+        version = (self.version or 0) + 1
+        block_name = f"{self.name}_v{version}"
+        
+        # Lay the arrays out back to back, each aligned for fast access
+        layout = {}
+        offset = 0
+        arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+        for key, value in arrays.items():
+            offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+            layout[key] = [offset, list(value.shape), value.dtype.str]
+            offset += value.nbytes
+        
+        block = shared_memory.SharedMemory(name=block_name, create=True, size=max(offset, 1))
+        for key, value in arrays.items():
+            start = layout[key][0]
+            target = np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf, offset=start)
+            target[...] = value
+        
+        self._write_manifest({
+            'version': version,
+            'block': block_name,
+            'arrays': layout,
+            'meta': meta or {}
+        })
+        
+        # Unlinking only removes the name; workers that still map it are unaffected
+        previous = self._block
+        self._map(block, layout, version, meta or {})
+        if previous is not None:
+            previous.unlink()
+            self._close(previous)
+        
+        print(f"✓ Published {len(arrays)} arrays to shared memory (version {version})")
+        return version
+    
+    def _create_manifest(self):
+        """Create the manifest block, taking over one left behind by a crashed loader"""
+        manifest_name = f"{self.name}_manifest"
+        try:
+            self._manifest = shared_memory.SharedMemory(
+                name=manifest_name, create=True, size=_MANIFEST_SIZE)
+            self._manifest.buf[:_HEADER.size] = _HEADER.pack(0, 0)
+        except FileExistsError:
+            self._manifest = shared_memory.SharedMemory(name=manifest_name)
+            stale = self._read_manifest()
+            if stale is not None:
+                # Continue the version sequence so workers notice the change
+                self.version = stale['version']
+                try:
+                    shared_memory.SharedMemory(name=stale['block']).unlink()
+                except FileNotFoundError:
+                    pass
+        
+        self._owner = True
+    
+    def _write_manifest(self, manifest):
+        """Write the manifest under a sequence counter so readers never see half of it"""
+        payload = json.dumps(manifest).encode('utf-8')
+        if len(payload) > _MANIFEST_SIZE - _HEADER.size:
+            raise ValueError("Shared store manifest is too large")
+        
+        sequence, _ = _HEADER.unpack_from(self._manifest.buf, 0)
+        _HEADER.pack_into(self._manifest.buf, 0, sequence + 1, 0)
+        self._manifest.buf[_HEADER.size:_HEADER.size + len(payload)] = payload
+        _HEADER.pack_into(self._manifest.buf, 0, sequence + 2, len(payload))
+    
+    def _read_manifest(self):
+        """Read a consistent copy of the manifest (None if nothing is published yet)"""
+        while True:
+            sequence, length = _HEADER.unpack_from(self._manifest.buf, 0)
+            if sequence % 2 == 0:
+                if length == 0:
+                    return None
+                payload = bytes(self._manifest.buf[_HEADER.size:_HEADER.size + length])
+                if _HEADER.unpack_from(self._manifest.buf, 0)[0] == sequence:
+                    return json.loads(payload)
+            time.sleep(0.001)
+    
+    def attach(self):
+        """
+        Attach to the arrays published by the loader process
+        
+        Returns:
+            True if attached successfully
+        """
+        try:
+            if self._manifest is None:
+                self._manifest = _open_block(f"{self.name}_manifest")
+            
+            manifest = self._read_manifest()
+            if manifest is None:
+                print(f"✗ Nothing published in shared store {self.name} yet")
+                return False
+            
+            block = _open_block(manifest['block'])
+            
+            previous = self._block
+            self._map(block, manifest['arrays'], manifest['version'], manifest['meta'])
+            if previous is not None:
+                self._close(previous)
+            
+            return True
+        
+        except FileNotFoundError:
+            print(f"✗ No shared store named {self.name}")
+            return False
+    
+    def refresh(self):
+        """
+        Remap if the loader published a new version
+        
+        Returns:
+            True if the arrays were remapped
+        """
+        if self._manifest is None:
+            return self.attach()
+        
+        manifest = self._read_manifest()
+        if manifest is None or manifest['version'] == self.version:
+            return False
+        
+        return self.attach()
+    
+    def _map(self, block, layout, version, meta):
+        """Create read-only views over a shared memory block"""
+        arrays = {}
+        for key, (offset, shape, dtype) in layout.items():
+            view = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+            view.flags.writeable = False
+            arrays[key] = view
+        
+        self._block = block
+        self.arrays = arrays
+        self.version = version
+        self.meta = meta
+    
+    def _close(self, block):
+        """Close a block, deferring it while views into it are still alive"""
+        self._retired.append(block)
+        still_open = []
+        for retired in self._retired:
+            try:
+                retired.close()
+            except BufferError:
+                still_open.append(retired)
+        self._retired = still_open
+    
+    def close(self):
+        """Detach from the store (and remove it if this process published it)"""
+        block = self._block
+        self.arrays = {}
+        self._block = None
+        
+        if block is not None:
+            if self._owner:
+                block.unlink()
+            self._close(block)
+        
+        if self._manifest is not None:
+            if self._owner:
+                self._manifest.unlink()
+            self._manifest.close()
+            self._manifest = None
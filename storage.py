@@ -0,0 +1,358 @@
+"""
+Storage Module
+Persistence backends for energy readings (CSV file or local SQLite database)
+"""
+
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import config
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _to_epoch_seconds(times):
+    """Convert datetimes to integer seconds since the epoch"""
+    return pd.DatetimeIndex(times).to_numpy('datetime64[ns]').view('int64') // 10**9
+
+
+class CSVStorage:
+    """Readings stored in a flat CSV file, one column per series"""
+    
+    def __init__(self, path=None):
+        """
+        Initialize the CSV backend
+        
+        Args:
+            path: CSV file path (defaults to config.DATASET_FILE)
+        """
+        self.path = path or config.DATASET_FILE
+        self._frame = None
+        self._mtime = None
+    
+    def _read(self):
+        """Parse the CSV file (again only if it changed) and keep it sorted by time"""
+        mtime = os.path.getmtime(self.path)
+        if self._frame is None or mtime != self._mtime:
+            frame = pd.read_csv(self.path)
+            frame[config.DATETIME_COL] = pd.to_datetime(frame[config.DATETIME_COL])
+            self._frame = frame.sort_values(config.DATETIME_COL)
+            self._mtime = mtime
+        return self._frame
+    
+    def list_series(self):
+        """Get the names of the stored series"""
+        return [col for col in self._read().columns if col != config.DATETIME_COL]
+    
+    def load(self, series=None):
+        """
+        Load one series
+        
+        Args:
+            series: Series (column) name (defaults to config.ENERGY_COL)
+        
+        Returns:
+            DataFrame with datetime and energy columns
+        """
+        series = series or config.ENERGY_COL
+        frame = self._read()[[config.DATETIME_COL, series]]
+        return frame.rename(columns={series: config.ENERGY_COL})
+    
+    def append(self, df, series=None):
+        """
+        Append readings to the end of the CSV file
+        
+        Args:
+            df: DataFrame with datetime and energy columns
+            series: Series (column) name (defaults to config.ENERGY_COL)
+        
+        Returns:
+            Number of rows written
+        """
+        series = series or config.ENERGY_COL
+        rows = df[[config.DATETIME_COL, config.ENERGY_COL]].rename(columns={config.ENERGY_COL: series})
+        rows.to_csv(self.path, mode='a', header=False, index=False)
+        self._frame = None
+        return len(rows)
+    
+    def range_stats(self, start, end, series=None):
+        """
+        Get statistics for readings between two datetimes (inclusive)
+        
+        Returns:
+            Dictionary with count, total, mean, min and max
+        """
+        frame = self.load(series)
+        times = frame[config.DATETIME_COL]
+        values = frame.loc[(times >= pd.Timestamp(start)) & (times <= pd.Timestamp(end)),
+                           config.ENERGY_COL]
+        
+        return {
+            'count': int(values.count()),
+            'total': float(values.sum()),
+            'mean': float(values.mean()) if len(values) else None,
+            'min': float(values.min()) if len(values) else None,
+            'max': float(values.max()) if len(values) else None
+        }
+
+
+class SQLiteStorage:
+    """Readings stored in a local SQLite database with pre-aggregated tables"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS readings (
+            series TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            value REAL NOT NULL,
+            count INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (series, ts)
+        ) WITHOUT ROWID;
+        
+        CREATE TABLE IF NOT EXISTS daily_agg (
+            series TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            PRIMARY KEY (series, day)
+        ) WITHOUT ROWID;
+        
+        CREATE TABLE IF NOT EXISTS monthly_agg (
+            series TEXT NOT NULL,
+            month TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            PRIMARY KEY (series, month)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, path=None):
+        """
+        Initialize the SQLite backend
+        
+        Args:
+            path: Database file path (defaults to config.SQLITE_FILE)
+        """
+        self.path = path or config.SQLITE_FILE
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        
+        # WAL lets readers run concurrently with a writer
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def list_series(self):
+        """Get the names of the stored series"""
+        rows = self.conn.execute('SELECT DISTINCT series FROM daily_agg ORDER BY series')
+        return [row[0] for row in rows]
+    
+    def load(self, series=None):
+        """
+        Load one series
+        
+        On first use an empty database is seeded from config.DATASET_FILE.
+        A timestamp stored from several readings is returned once per
+        reading (at their mean), so duplicate counts and totals match the
+        CSV backend.
+        
+        Args:
+            series: Series name (defaults to config.ENERGY_COL)
+        
+        Returns:
+            DataFrame with datetime and energy columns
+        """
+        series = series or config.ENERGY_COL
+        
+        if not self.list_series() and os.path.exists(config.DATASET_FILE):
+            self.import_csv(config.DATASET_FILE)
+        
+        rows = self.conn.execute(
+            'SELECT ts, value, count FROM readings WHERE series = ? ORDER BY ts', (series,)
+        ).fetchall()
+        data = np.array(rows, dtype=float).reshape(-1, 3)
+        data = np.repeat(data[:, :2], data[:, 2].astype(np.int64), axis=0)
+        
+        return pd.DataFrame({
+            config.DATETIME_COL: pd.to_datetime(data[:, 0].astype(np.int64), unit='s'),
+            config.ENERGY_COL: data[:, 1]
+        })
+    
+    def import_csv(self, path, series=None):
+        """
+        Bulk import a CSV file (every non-datetime column becomes a series)
+        
+        Args:
+            path: CSV file path
+            series: Import only this column
+        
+        Returns:
+            Number of rows stored
+        """
+        frame = pd.read_csv(path)
+        frame[config.DATETIME_COL] = pd.to_datetime(frame[config.DATETIME_COL])
+        columns = [series] if series else [c for c in frame.columns if c != config.DATETIME_COL]
+        
+        readings = 0
+        written = 0
+        for column in columns:
+            part = frame[[config.DATETIME_COL, column]].dropna()
+            readings += len(part)
+            written += self.append(part.rename(columns={column: config.ENERGY_COL}), column)
+        
+        print(f"✓ Imported {readings} readings into {self.path} ({written} rows)")
+        if readings > written:
+            print(f"ℹ Merged {readings - written} readings with duplicate timestamps")
+        return written
+    
+    def append(self, df, series=None):
+        """
+        Insert readings in one transaction and refresh the affected aggregates
+        
+        Readings that share a timestamp (e.g. the repeated hour when DST
+        ends) are stored as one row holding their mean and count, the same
+        way the hourly grid averages them. Rows are written in batches of
+        config.SQLITE_BATCH_SIZE with executemany; rows with an existing
+        timestamp are replaced.
+        
+        Args:
+            df: DataFrame with datetime and energy columns
+            series: Series name (defaults to config.ENERGY_COL)
+        
+        Returns:
+            Number of rows stored
+        """
+        series = series or config.ENERGY_COL
+        if len(df) == 0:
+            return 0
+        
+        # Average duplicate timestamps before they reach the primary key
+        ts, inverse, counts = np.unique(_to_epoch_seconds(df[config.DATETIME_COL]),
+                                        return_inverse=True, return_counts=True)
+        values = np.bincount(inverse, weights=df[config.ENERGY_COL].to_numpy(dtype=float)) / counts
+        rows = list(zip([series] * len(ts), ts.tolist(), values.tolist(), counts.tolist()))
+        
+        first_day = int(ts.min() // DAY_SECONDS)
+        last_day = int(ts.max() // DAY_SECONDS)
+        
+        with self.conn:
+            batch = config.SQLITE_BATCH_SIZE
+            for i in range(0, len(rows), batch):
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO readings (series, ts, value, count) VALUES (?, ?, ?, ?)',
+                    rows[i:i + batch])
+            
+            # Rebuild only the days and months the new rows fall into
+            self.conn.execute("""
+                INSERT OR REPLACE INTO daily_agg (series, day, count, total, min, max)
+                SELECT series, ts / 86400, SUM(count), SUM(value * count), MIN(value), MAX(value)
+                FROM readings
+                WHERE series = ? AND ts >= ? AND ts < ?
+                GROUP BY ts / 86400
+            """, (series, first_day * DAY_SECONDS, (last_day + 1) * DAY_SECONDS))
+            
+            months = "strftime('%Y-%m', day * 86400, 'unixepoch')"
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO monthly_agg (series, month, count, total, min, max)
+                SELECT series, {months}, SUM(count), SUM(total), MIN(min), MAX(max)
+                FROM daily_agg
+                WHERE series = ? AND {months} BETWEEN
+                    strftime('%Y-%m', ?, 'unixepoch') AND strftime('%Y-%m', ?, 'unixepoch')
+                GROUP BY {months}
+            """, (series, first_day * DAY_SECONDS, last_day * DAY_SECONDS))
+        
+        return len(rows)
+    
+    def range_stats(self, start, end, series=None):
+        """
+        Get statistics for readings between two datetimes (inclusive)
+        
+        Whole days inside the range are read from daily_agg; only the partial
+        days at either end touch the readings table.
+        
+        Returns:
+            Dictionary with count, total, mean, min and max
+        """
+        series = series or config.ENERGY_COL
+        start_ts = int(_to_epoch_seconds([start])[0])
+        end_ts = int(_to_epoch_seconds([end])[0])
+        
+        first_full_day = -(-start_ts // DAY_SECONDS)
+        end_full_day = (end_ts + 1) // DAY_SECONDS
+        
+        parts = []
+        if first_full_day < end_full_day:
+            parts.append(self.conn.execute("""
+                SELECT SUM(count), SUM(total), MIN(min), MAX(max) FROM daily_agg
+                WHERE series = ? AND day >= ? AND day < ?
+            """, (series, first_full_day, end_full_day)).fetchone())
+            edges = [(start_ts, first_full_day * DAY_SECONDS - 1),
+                     (end_full_day * DAY_SECONDS, end_ts)]
+        else:
+            edges = [(start_ts, end_ts)]
+        
+        for lo, hi in edges:
+            if lo <= hi:
+                parts.append(self.conn.execute("""
+                    SELECT SUM(count), SUM(value * count), MIN(value), MAX(value) FROM readings
+                    WHERE series = ? AND ts BETWEEN ? AND ?
+                """, (series, lo, hi)).fetchone())
+        
+        parts = [p for p in parts if p[0]]
+        count = sum(p[0] for p in parts)
+        total = sum(p[1] for p in parts)
+        
+        return {
+            'count': count,
+            'total': float(total),
+            'mean': total / count if count else None,
+            'min': min(p[2] for p in parts) if parts else None,
+            'max': max(p[3] for p in parts) if parts else None
+        }
+    
+    def daily_totals(self, start=None, end=None, series=None):
+        """Get pre-aggregated daily totals as a Series indexed by date"""
+        series = series or config.ENERGY_COL
+        lo = int(_to_epoch_seconds([start])[0] // DAY_SECONDS) if start is not None else -2**62
+        hi = int(_to_epoch_seconds([end])[0] // DAY_SECONDS) if end is not None else 2**62
+        
+        rows = self.conn.execute(
+            'SELECT day, total FROM daily_agg WHERE series = ? AND day BETWEEN ? AND ? ORDER BY day',
+            (series, lo, hi)
+        ).fetchall()
+        days = pd.to_datetime([row[0] for row in rows], unit='D').date
+        return pd.Series([row[1] for row in rows], index=days, name=config.ENERGY_COL, dtype=float)
+    
+    def monthly_totals(self, series=None):
+        """Get pre-aggregated monthly totals as a Series indexed by 'YYYY-MM'"""
+        series = series or config.ENERGY_COL
+        rows = self.conn.execute(
+            'SELECT month, total FROM monthly_agg WHERE series = ? ORDER BY month', (series,)
+        ).fetchall()
+        return pd.Series(dict(rows), name=config.ENERGY_COL, dtype=float)
+
+
+def get_storage(backend=None):
+    """
+    Create the storage backend selected in config
+    
+    Args:
+        backend: 'csv' or 'sqlite' (defaults to config.STORAGE_BACKEND)
+    
+    Returns:
+        CSVStorage or SQLiteStorage instance
+    """
+    backend = backend or config.STORAGE_BACKEND
+    if backend == 'sqlite':
+        return SQLiteStorage()
+    if backend == 'csv':
+        return CSVStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")